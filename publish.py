@@ -8,32 +8,164 @@ Usage:
     python publish.py --build                         # Build only, don't publish
     python publish.py --token-file /path/to/token     # Publish with token from file
     python publish.py --prod --token-file /path/to/token  # Publish to prod with token file
+    python publish.py --force-refresh                 # Upgrade build/twine before building
+    python publish.py --legacy-subprocess             # Run build/twine as subprocesses
+    python publish.py --pipeline                      # Upload the sdist while the wheel builds
 """
 
 import argparse
+import importlib.util
+import os
+import shlex
 import shutil
 import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 
+_TWINE_UPLOAD = (sys.executable, "-m", "twine", "upload")
 
-def run(cmd: list[str], check: bool = True, mask_token: bool = False) -> subprocess.CompletedProcess:
-    """Run a command and return the result."""
-    if mask_token:
-        # Mask the token in the output
-        masked_cmd = []
-        for i, part in enumerate(cmd):
-            if i > 0 and cmd[i-1] == "-p":
-                masked_cmd.append("***")
-            else:
-                masked_cmd.append(part)
-        print(f"  $ {' '.join(masked_cmd)}")
-    else:
-        print(f"  $ {' '.join(cmd)}")
-    return subprocess.run(cmd, check=check)
 
+def _log(cmd: list[str]) -> None:
+    """Print a command before it is run."""
+    print(f"  $ {' '.join(cmd)}")
+
+
+def _twine_env(token: Optional[str]) -> dict[str, str]:
+    """Environment for twine subprocesses, carrying the token if one is set.
+
+    Passing the token this way keeps it out of argv, so it never shows up in
+    logged commands or the process list.
+    """
+    env = os.environ.copy()
+    if token:
+        env["TWINE_USERNAME"] = "__token__"
+        env["TWINE_PASSWORD"] = token
+    return env
+
+
+class _RmtreeThread(threading.Thread):
+    """Delete a directory tree; join() re-raises any error from the deletion."""
+
+    def __init__(self, path: Path) -> None:
+        super().__init__()
+        self.path = path
+        self.error: Optional[BaseException] = None
+
+    def run(self) -> None:
+        try:
+            shutil.rmtree(self.path)
+        except BaseException as e:
+            self.error = e
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        super().join(timeout)
+        if self.error is not None:
+            raise self.error
+
+
+def _async_rmtree(path: Path, aside_dir: Path) -> Optional[_RmtreeThread]:
+    """Move a directory into aside_dir and delete it in the background.
+
+    aside_dir must be outside the tree the build packs (src/), or the build
+    could pick up a half-deleted directory.
+    """
+    doomed = aside_dir / f".__rm_{os.getpid()}_{path.name}"
+    try:
+        os.rename(path, doomed)
+    except OSError:
+        # e.g. cross-device or permission issues - delete in place instead
+        shutil.rmtree(path)
+        return None
+    thread = _RmtreeThread(doomed)
+    thread.start()
+    return thread
+
+
+def build_in_process(src_dir: Path) -> None:
+    """Build the sdist, then the wheel from it, in this interpreter."""
+    from build.__main__ import main as build_main
+
+    # No --sdist/--wheel: like `python -m build`, the wheel is built from the
+    # sdist, which catches files missing from the sdist
+    print(f"  build {src_dir}")
+    try:
+        build_main([str(src_dir)])
+    except SystemExit as e:
+        # build reports failures by exiting; surface them without a traceback
+        if e.code:
+            print("\n❌ Error: Build failed")
+            sys.exit(1)
+
+
+def upload_in_process(repository: str, token: Optional[str], dist_dir: Path) -> None:
+    """Upload built distributions using twine in this interpreter."""
+    from twine.commands.upload import upload
+    from twine.settings import Settings
+
+    print(f"  twine upload --repository {repository} {dist_dir / '*'}")
+    settings = Settings(
+        repository_name=repository,
+        username="__token__" if token else None,
+        password=token,
+    )
+    try:
+        upload(settings, [str(dist_dir / "*")])
+    except SystemExit as e:
+        if e.code:
+            print("\n❌ Error: Upload failed")
+            sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: Upload failed: {e}")
+        sys.exit(1)
+
+
+def pipeline_build_and_upload(
+    python: str, src_dir: Path, upload_cmd: list[str], dist_dir: Path, token: Optional[str]
+) -> None:
+    """Build the sdist, then upload it while the wheel is being built.
+
+    Each distribution is uploaded only after the build process that wrote it
+    has exited successfully, so a partially written file never reaches PyPI.
+    """
+    env = _twine_env(token)
+
+    def build(kind: str) -> list[str]:
+        """Run one build step and return the distributions it added."""
+        before = set(dist_dir.glob("*")) if dist_dir.is_dir() else set()
+        cmd = [python, "-m", "build", f"--{kind}", str(src_dir)]
+        _log(cmd)
+        if subprocess.run(cmd).returncode != 0:
+            return []
+        return sorted(str(p) for p in set(dist_dir.glob("*")) - before)
 
-def main():
+    def upload(paths: list[str]) -> int:
+        _log(upload_cmd + paths)
+        return subprocess.run(upload_cmd + paths, env=env).returncode
+
+    sdists = build("sdist")
+    if not sdists:
+        print("\n❌ Error: Build failed")
+        sys.exit(1)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        sdist_upload = executor.submit(upload, sdists)
+        wheels = build("wheel")
+        sdist_status = sdist_upload.result()
+
+    if not wheels:
+        print("\n❌ Error: Build failed")
+        if sdist_status == 0:
+            print("   The sdist was already uploaded; upload the wheel once it builds.")
+        sys.exit(1)
+    if sdist_status != 0 or upload(wheels) != 0:
+        print("\n❌ Error: Upload failed")
+        sys.exit(1)
+
+
+def main() -> None:
     parser = argparse.ArgumentParser(
         description="Build and publish mcp-base to PyPI"
     )
@@ -52,55 +184,65 @@ def main():
         type=str,
         help="Path to file containing PyPI API token"
     )
+    parser.add_argument(
+        "--force-refresh",
+        action="store_true",
+        help="Always upgrade build and twine, even if already installed"
+    )
+    parser.add_argument(
+        "--legacy-subprocess",
+        action="store_true",
+        help="Run build and twine as subprocesses instead of in-process"
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Upload the sdist while the wheel builds (Test PyPI only; runs build/twine as subprocesses)"
+    )
     args = parser.parse_args()
 
+    if args.pipeline and args.prod and not args.build:
+        # A failed wheel build would leave the already-uploaded sdist behind,
+        # and a filename can never be uploaded to PyPI twice
+        parser.error("--pipeline cannot be combined with --prod")
+
     script_dir = Path(__file__).parent.resolve()
 
     # Clean previous builds
     print("\n🧹 Cleaning previous builds...")
-    for path in ["dist", "build"]:
-        full_path = script_dir / path
-        if full_path.exists():
-            shutil.rmtree(full_path)
-    for egg_info in script_dir.glob("src/*.egg-info"):
-        shutil.rmtree(egg_info)
-
-    # Ensure build tools are installed
-    print("\n📦 Checking build tools...")
-    run([sys.executable, "-m", "pip", "install", "--quiet", "--upgrade", "build", "twine"])
-
-    # Build the package
-    print("\n🔨 Building package...")
-    run([sys.executable, "-m", "build"], check=True)
-
-    # Show what was built
-    print("\n✅ Built packages:")
-    for f in (script_dir / "dist").iterdir():
-        print(f"   {f.name}")
-
-    if args.build:
-        print("\n✅ Build complete. Packages are in dist/")
-        return
+    targets = [
+        p for p in (script_dir / "dist", script_dir / "build", *script_dir.glob("src/*.egg-info"))
+        if p.exists()
+    ]
+    # Directories are renamed into the project root (outside the sdist's src/)
+    # immediately and deleted while the build runs
+    cleanup_threads = [
+        t for t in (_async_rmtree(p, script_dir) for p in targets) if t is not None
+    ]
 
     # Read token from file if specified
     token = None
-    if args.token_file:
+    if args.token_file and not args.build:
         token_path = Path(args.token_file).expanduser()
-        if not token_path.exists():
-            print(f"\n❌ Error: Token file not found: {token_path}")
-            sys.exit(1)
         try:
             token = token_path.read_text().strip()
-            if not token:
-                print(f"\n❌ Error: Token file is empty: {token_path}")
-                sys.exit(1)
-            print(f"\n🔑 Using token from: {token_path}")
-        except Exception as e:
+        except FileNotFoundError:
+            print(f"\n❌ Error: Token file not found: {token_path}")
+            sys.exit(1)
+        except PermissionError:
+            print(f"\n❌ Error: Permission denied reading token file: {token_path}")
+            sys.exit(1)
+        except OSError as e:
             print(f"\n❌ Error reading token file: {e}")
             sys.exit(1)
+        if not token:
+            print(f"\n❌ Error: Token file is empty: {token_path}")
+            sys.exit(1)
+        print(f"\n🔑 Using token from: {token_path}")
 
-    # Confirm before publishing to production
-    if args.prod:
+    # Confirm before publishing to production (asked up front so the
+    # install/build/upload steps can run back to back)
+    if args.prod and not args.build:
         print("\n⚠️  WARNING: You are about to publish to PRODUCTION PyPI!")
         confirm = input("Are you sure? (yes/no): ").strip().lower()
         if confirm != "yes":
@@ -110,22 +252,87 @@ def main():
     else:
         repository = "testpypi"
 
-    # Publish
-    print(f"\n🚀 Publishing to {repository}...")
+    # Only hit PyPI for build tools that are not importable already
+    build_tools = ("build", "twine")
+    if args.force_refresh:
+        missing_tools = list(build_tools)
+    else:
+        missing_tools = [m for m in build_tools if importlib.util.find_spec(m) is None]
+    pip_cmd = [sys.executable, "-m", "pip", "install", "--quiet", "--upgrade", *missing_tools]
+    build_cmd = [sys.executable, "-m", "build"]
+
+    dist_dir = script_dir / "dist"
 
     # Build upload command
-    upload_cmd = [sys.executable, "-m", "twine", "upload"]
-    if repository == "testpypi":
-        upload_cmd.extend(["--repository", "testpypi"])
+    repository_args = ("--repository", "testpypi") if repository == "testpypi" else ()
+    upload_cmd = [*_TWINE_UPLOAD, *repository_args]
 
-    # Add token authentication if provided
-    if token:
-        upload_cmd.extend(["-u", "__token__", "-p", token])
+    # Twine expands the dist/* glob itself, so it is safe to quote below
+    use_pipeline = args.pipeline and not args.build
+    use_shell = not use_pipeline and args.legacy_subprocess and shutil.which("bash") is not None
+    if use_shell:
+        # Run install, build and upload in a single shell to avoid paying
+        # for a separate process launch per step
+        steps = [pip_cmd, build_cmd] if missing_tools else [build_cmd]
+        if not args.build:
+            steps.append(upload_cmd + ["dist/*"])
+        script = " && ".join(shlex.join(step) for step in steps)
+
+        if not missing_tools:
+            print("\n📦 Build tools already installed")
+        print("\n🔨 Building" + ("" if args.build else " and publishing") + "...")
+        print(f"  $ {script}")
+        subprocess.run(["bash", "-c", script], check=True, env=_twine_env(token))
+    else:
+        # Ensure build tools are installed
+        print("\n📦 Checking build tools...")
+        if missing_tools:
+            _log(pip_cmd)
+            subprocess.run(pip_cmd, check=True)
+            importlib.invalidate_caches()
+        else:
+            print("  build and twine already installed")
+
+        # Build the package
+        print("\n🔨 Building package...")
+        if use_pipeline:
+            print(f"   (uploading the sdist to {repository} while the wheel builds)")
+            pipeline_build_and_upload(
+                sys.executable,
+                script_dir,
+                upload_cmd,
+                dist_dir,
+                token,
+            )
+        elif args.legacy_subprocess:
+            _log(build_cmd)
+            subprocess.run(build_cmd, check=True)
+        else:
+            build_in_process(script_dir)
+
+    for thread in cleanup_threads:
+        thread.join()
+
+    # Show what was built
+    print("\n✅ Built packages:")
+    with os.scandir(dist_dir) as entries:
+        for entry in entries:
+            print(f"   {entry.name}")
+
+    if args.build:
+        print("\n✅ Build complete. Packages are in dist/")
+        return
 
-    upload_cmd.append("dist/*")
+    if not (use_shell or use_pipeline):
+        # Publish
+        print(f"\n🚀 Publishing to {repository}...")
 
-    # Run the upload (mask token in output if present)
-    run(upload_cmd, mask_token=bool(token))
+        if args.legacy_subprocess:
+            upload_cmd.append("dist/*")
+            _log(upload_cmd)
+            subprocess.run(upload_cmd, check=True, env=_twine_env(token))
+        else:
+            upload_in_process(repository, token, dist_dir)
 
     if repository == "testpypi":
         print("\n✅ Published to Test PyPI!")
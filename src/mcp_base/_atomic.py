@@ -0,0 +1,44 @@
+"""
+Crash-safe file writes for generated config files.
+
+Several of these files hold client secrets, so an interrupted write must never
+leave a truncated file behind, and restrictive permissions must survive a rewrite.
+"""
+
+import os
+import shutil
+from typing import Optional, Union
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+def write_atomic(path: PathLike, data: bytes, mode: Optional[int] = None) -> None:
+    """
+    Replace a file's contents without ever leaving it half written.
+
+    The data goes to a fsynced temp file that is renamed over the target.
+    With mode, the temp file is created with those permissions, so the data
+    is never readable more widely; otherwise permissions already set on the
+    target are kept.
+    """
+    path = os.fspath(path)
+    tmp_file = path + ".tmp"
+    try:
+        # Clear out a temp file left behind by a crash so the create mode applies
+        if os.path.lexists(tmp_file):
+            os.unlink(tmp_file)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL
+        fd = os.open(tmp_file, flags, 0o666 if mode is None else mode)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if mode is None and os.path.exists(path):
+            shutil.copymode(path, tmp_file)
+        os.replace(tmp_file, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_file)
+        except OSError:
+            pass
+        raise
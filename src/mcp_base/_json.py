@@ -0,0 +1,31 @@
+"""
+JSON helpers that use orjson when it is installed.
+
+Install with: pip install mcp-base[speedups]
+"""
+
+import json
+from json import JSONDecodeError  # orjson.JSONDecodeError subclasses this
+from typing import Any, Union
+
+__all__ = ["JSONDecodeError", "dumps", "loads"]
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+def dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes (2-space indented if pretty)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    # Emit UTF-8 like orjson does rather than \uXXXX escapes
+    return json.dumps(obj, indent=2 if pretty else None, ensure_ascii=False).encode()
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
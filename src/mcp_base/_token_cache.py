@@ -0,0 +1,62 @@
+"""
+On-disk cache for Auth0 management API tokens.
+
+Tokens are stored per tenant/client under $XDG_CACHE_HOME/mcp-base (default
+~/.cache/mcp-base), readable only by the owner, until shortly before they expire.
+"""
+
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from mcp_base._atomic import write_atomic
+from mcp_base._json import dumps, loads
+
+# Treat a token this close to expiry as already expired
+EXPIRY_MARGIN = 60
+
+
+def token_cache_path(domain: str, client_id: str) -> Path:
+    """Return the on-disk cache location for a tenant/client token."""
+    cache_home = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    digest = hashlib.sha256((domain + client_id).encode()).hexdigest()[:16]
+    return cache_home / "mcp-base" / f"token-{digest}.json"
+
+
+def get_cached_token(domain: str, client_id: str) -> Optional[str]:
+    """Return a cached management token if it is still valid, else None."""
+    try:
+        cached = loads(token_cache_path(domain, client_id).read_bytes())
+        if cached["exp"] > time.time() + EXPIRY_MARGIN:
+            access_token: str = cached["access_token"]
+            return access_token
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def save_cached_token(domain: str, client_id: str, access_token: str, expires_in: float) -> None:
+    """Cache a management token (owner-readable only) until it expires."""
+    try:
+        cache_path = token_cache_path(domain, client_id)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # A 0600 temp file is renamed over the old cache, so the token is never
+        # in a wider-permissioned or half-written file
+        write_atomic(
+            cache_path,
+            dumps({"access_token": access_token, "exp": time.time() + expires_in}),
+            mode=0o600,
+        )
+    except (OSError, TypeError):
+        # Caching is best effort; the token is still usable for this run
+        pass
+
+
+def clear_cached_token(domain: str, client_id: str) -> None:
+    """Remove a cached management token."""
+    try:
+        token_cache_path(domain, client_id).unlink()
+    except (OSError, TypeError):
+        pass
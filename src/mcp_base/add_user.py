@@ -12,11 +12,90 @@ Supports adding users to:
 """
 
 import argparse
-import json
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from mcp_base import __version__
+from mcp_base._json import dumps, loads
+from mcp_base._token_cache import clear_cached_token, get_cached_token, save_cached_token
+
+if TYPE_CHECKING:
+    import requests
+
+
+def create_session() -> "requests.Session":
+    """Create a pooled HTTP session that retries transient Auth0 errors."""
+    # Imported here so --help and early config errors don't pay for requests
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=4,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                raise_on_status=False,
+            ),
+        ),
+    )
+    session.headers["User-Agent"] = f"mcp-base/{__version__}"
+    return session
+
+
+def fetch_management_token(
+    session: "requests.Session",
+    domain: str,
+    client_id: str,
+    client_secret: str,
+    use_cache: bool = True
+) -> str:
+    """Exchange management client credentials for an API token."""
+    token_response = session.post(
+        f"https://{domain}/oauth/token",
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+        data={
+            "grant_type": "client_credentials",
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "audience": f"https://{domain}/api/v2/"
+        }
+    )
+
+    if token_response.status_code != 200:
+        print(f"Error: Failed to get management token: {token_response.text}")
+        sys.exit(1)
+
+    token_data = loads(token_response.content)
+    access_token: str = token_data["access_token"]
+    if use_cache and token_data.get("expires_in"):
+        save_cached_token(domain, client_id, access_token, token_data["expires_in"])
+    return access_token
 
-import requests
+
+def search_users(session: "requests.Session", domain: str, email: str) -> "requests.Response":
+    """Look up users by email, preferring the exact-match users-by-email endpoint."""
+    response = session.get(
+        f"https://{domain}/api/v2/users-by-email",
+        params={"email": email}
+    )
+    if response.status_code == 200 and loads(response.content):
+        return response
+
+    if response.status_code in (200, 400, 404):
+        # users-by-email is case-sensitive; the search index is not, so a
+        # mixed-case stored address is still found
+        response = session.get(
+            f"https://{domain}/api/v2/users",
+            params={"q": f'email:"{email}"'}
+        )
+    return response
 
 
 def load_auth0_config():
@@ -26,8 +105,7 @@ def load_auth0_config():
         print("Error: auth0-config.json not found")
         sys.exit(1)
 
-    with open(config_file) as f:
-        return json.load(f)
+    return loads(config_file.read_bytes())
 
 
 def prompt_client_type():
@@ -65,6 +143,11 @@ def main():
         choices=["server", "test", "both"],
         help="Which client to grant access to (server=production, test=testing, both=both)"
     )
+    parser.add_argument(
+        "--no-token-cache",
+        action="store_true",
+        help="Don't read or write the cached management API token"
+    )
 
     args = parser.parse_args()
 
@@ -74,6 +157,7 @@ def main():
     print()
 
     config = load_auth0_config()
+    session = create_session()
 
     domain = config.get("domain")
     mgmt_api = config.get("management_api", {})
@@ -100,23 +184,16 @@ def main():
     mgmt_client_id = mgmt_api.get("client_id")
     mgmt_client_secret = mgmt_api.get("client_secret")
 
-    token_response = requests.post(
-        f"https://{domain}/oauth/token",
-        headers={"Content-Type": "application/x-www-form-urlencoded"},
-        data={
-            "grant_type": "client_credentials",
-            "client_id": mgmt_client_id,
-            "client_secret": mgmt_client_secret,
-            "audience": f"https://{domain}/api/v2/"
-        }
-    )
-
-    if token_response.status_code != 200:
-        print(f"Error: Failed to get management token: {token_response.text}")
-        sys.exit(1)
-
-    mgmt_token = token_response.json()["access_token"]
-    print("Got management API token")
+    use_cache = not args.no_token_cache
+    mgmt_token = get_cached_token(domain, mgmt_client_id) if use_cache else None
+    token_from_cache = mgmt_token is not None
+    if token_from_cache:
+        print("Using cached management API token")
+    else:
+        mgmt_token = fetch_management_token(
+            session, domain, mgmt_client_id, mgmt_client_secret, use_cache=use_cache
+        )
+        print("Got management API token")
     print()
 
     # Get user email
@@ -131,23 +208,27 @@ def main():
     print()
     print(f"Looking up user: {user_email}")
 
-    headers = {
+    session.headers.update({
         "Authorization": f"Bearer {mgmt_token}",
         "Content-Type": "application/json"
-    }
+    })
 
     # Search for user by email
-    search_response = requests.get(
-        f"https://{domain}/api/v2/users",
-        headers=headers,
-        params={"q": f'email:"{user_email}"'}
-    )
+    search_response = search_users(session, domain, user_email)
+
+    if search_response.status_code == 401 and token_from_cache:
+        # Cached token was revoked or rotated; get a fresh one and retry
+        print("Cached management API token rejected, requesting a new one...")
+        clear_cached_token(domain, mgmt_client_id)
+        mgmt_token = fetch_management_token(session, domain, mgmt_client_id, mgmt_client_secret)
+        session.headers["Authorization"] = f"Bearer {mgmt_token}"
+        search_response = search_users(session, domain, user_email)
 
     if search_response.status_code != 200:
         print(f"Error: Failed to search users: {search_response.text}")
         sys.exit(1)
 
-    users = search_response.json()
+    users = loads(search_response.content)
 
     if not users:
         print(f"Error: User not found: {user_email}")
@@ -189,21 +270,20 @@ def main():
     print(f"Adding {', '.join(client_names)} to allowedClients...")
     allowed_clients.extend(clients_to_add)
 
-    patch_response = requests.patch(
+    patch_response = session.patch(
         f"https://{domain}/api/v2/users/{user_id}",
-        headers=headers,
-        json={
+        data=dumps({
             "app_metadata": {
                 "allowedClients": allowed_clients
             }
-        }
+        })
     )
 
     if patch_response.status_code != 200:
         print(f"Error: Failed to update user: {patch_response.text}")
         sys.exit(1)
 
-    updated_user = patch_response.json()
+    updated_user = loads(patch_response.content)
     updated_allowed = updated_user.get("app_metadata", {}).get("allowedClients", [])
 
     print("User updated!")
@@ -12,56 +12,66 @@ Commands:
     setup-rbac      Set up Kubernetes RBAC resources
 """
 
-import argparse
+import importlib
 import sys
+from typing import Dict
 
+# (command, implementing module, help text). Each module exposes main().
+_CMDS = (
+    ("add-user", "mcp_base.add_user", "Add users to allowed clients"),
+    ("create-secrets", "mcp_base.create_secrets", "Create Kubernetes secrets for MCP deployment"),
+    ("setup-oidc", "mcp_base.setup_oidc", "Set up OIDC provider (e.g., Auth0)"),
+    ("setup-rbac", "mcp_base.setup_rbac", "Set up Kubernetes RBAC resources"),
+)
 
-def main():
-    parser = argparse.ArgumentParser(
-        prog="mcp-base",
-        description="CLI tools for MCP server setup and management",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Commands:
-  add-user        Add users to allowed clients in your OIDC provider
-  create-secrets  Create Kubernetes secrets for MCP deployment
-  setup-oidc      Set up OIDC provider for MCP authentication
-  setup-rbac      Set up Kubernetes RBAC resources
+COMMANDS: Dict[str, str] = {name: module for name, module, _ in _CMDS}
 
+_COMMAND_LINES = "".join(f"  {name:<15} {help_text}\n" for name, _, help_text in _CMDS)
+
+EPILOG = "\nCommands:\n" + _COMMAND_LINES + """
 Examples:
   mcp-base setup-oidc --provider auth0 --domain your-tenant.auth0.com
   mcp-base create-secrets --namespace default --release-name my-server
   mcp-base add-user --email user@example.com
-        """
-    )
+"""
 
-    subparsers = parser.add_subparsers(dest="command", metavar="<command>")
+USAGE = f"""usage: mcp-base <command> [options]
 
-    # Add subcommand parsers (but delegate actual argument parsing to the modules)
-    subparsers.add_parser(
-        "add-user",
-        help="Add users to allowed clients",
-        add_help=False
-    )
+CLI tools for MCP server setup and management
+{EPILOG}
+Run 'mcp-base <command> --help' for command-specific options."""
 
-    subparsers.add_parser(
-        "create-secrets",
-        help="Create Kubernetes secrets for MCP deployment",
-        add_help=False
-    )
 
-    subparsers.add_parser(
-        "setup-oidc",
-        help="Set up OIDC provider (e.g., Auth0)",
-        add_help=False
-    )
+def main():
+    # Fast path: answer help and dispatch known commands without building
+    # an argparse parser that the subcommand would immediately discard
+    if len(sys.argv) < 2 or sys.argv[1] in ("-h", "--help"):
+        print(USAGE)
+        sys.exit(0)
 
-    subparsers.add_parser(
-        "setup-rbac",
-        help="Set up Kubernetes RBAC resources",
-        add_help=False
+    command = sys.argv[1]
+    if command in COMMANDS:
+        sys.argv = [f"mcp-base {command}"] + sys.argv[2:]
+        importlib.import_module(COMMANDS[command]).main()
+        return
+
+    # Anything else (unknown commands, leading options) goes through argparse
+    # so the user gets its usual error reporting
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="mcp-base",
+        description="CLI tools for MCP server setup and management",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=EPILOG
     )
 
+    subparsers = parser.add_subparsers(dest="command", metavar="<command>")
+
+    # Add subcommand parsers (but delegate actual argument parsing to the modules)
+    for name, _, help_text in _CMDS:
+        subparsers.add_parser(name, help=help_text, add_help=False)
+
     # Parse only the command, leave rest for submodules
     args, remaining = parser.parse_known_args()
 
@@ -72,25 +82,7 @@ Examples:
     # Restore remaining args for submodule parsing
     sys.argv = [f"mcp-base {args.command}"] + remaining
 
-    if args.command == "add-user":
-        from mcp_base.add_user import main as cmd_main
-        cmd_main()
-
-    elif args.command == "create-secrets":
-        from mcp_base.create_secrets import main as cmd_main
-        cmd_main()
-
-    elif args.command == "setup-oidc":
-        from mcp_base.setup_oidc import main as cmd_main
-        cmd_main()
-
-    elif args.command == "setup-rbac":
-        from mcp_base.setup_rbac import main as cmd_main
-        cmd_main()
-
-    else:
-        parser.print_help()
-        sys.exit(1)
+    importlib.import_module(COMMANDS[args.command]).main()
 
 
 if __name__ == "__main__":
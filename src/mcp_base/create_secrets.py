@@ -23,19 +23,49 @@ Usage:
 
 import os
 import sys
-import json
 import secrets
 import argparse
-import base64
-from typing import Dict, Any, Optional
+import binascii
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property, partial
+from pathlib import Path
+from typing import Callable, Dict, Any, Optional, Tuple
 
-try:
-    from kubernetes import client, config
-    from kubernetes.client.rest import ApiException
-except ImportError:
-    print("Error: kubernetes Python package not installed")
-    print("   Install with: pip install kubernetes")
-    sys.exit(1)
+from mcp_base._json import loads
+
+# Populated by _require_kubernetes() so --help doesn't pay for the import
+client: Any = None
+config: Any = None
+ApiException: Any = None
+
+
+def _require_kubernetes() -> None:
+    """Import the kubernetes client package on first use."""
+    global client, config, ApiException
+    if client is not None:
+        return
+    try:
+        from kubernetes import client, config
+        from kubernetes.client.rest import ApiException
+    except ImportError:
+        print("Error: kubernetes Python package not installed")
+        print("   Install with: pip install kubernetes")
+        sys.exit(1)
+
+
+# Parsed config files keyed by (absolute path, mtime_ns, size)
+_CONFIG_CACHE: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+
+
+def _load_json_cached(path: str) -> Dict[str, Any]:
+    """Load a JSON file, reusing the parsed result while the file is unchanged."""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    cached = _CONFIG_CACHE.get(key)
+    if cached is None:
+        cached = loads(Path(path).read_bytes())
+        _CONFIG_CACHE[key] = cached
+    return cached
 
 
 def generate_jwt_signing_key() -> str:
@@ -63,22 +93,19 @@ class KubernetesSecretCreator:
         app_name: str = "mcp-server",
         dry_run: bool = False
     ):
+        _require_kubernetes()
         self.dry_run = dry_run
         self.app_name = app_name
 
-        try:
-            config.load_kube_config()
-            print("Loaded kubeconfig")
-        except config.config_exception.ConfigException:
+        # Dry runs only read from the cluster, so credentials (which may run
+        # exec plugins) are loaded on the first existence check instead
+        if not dry_run:
             try:
-                config.load_incluster_config()
-                print("Loaded in-cluster config")
-            except:
+                self._load_kube_config()
+            except Exception:
                 print("Error: Could not load Kubernetes configuration")
                 sys.exit(1)
 
-        self.k8s_client = client.CoreV1Api()
-
         if namespace:
             self.namespace = namespace
             print(f"Using specified namespace: {self.namespace}")
@@ -86,13 +113,53 @@ class KubernetesSecretCreator:
             self.namespace = self._get_current_namespace()
             print(f"Using namespace from context: {self.namespace}")
 
+        if dry_run:
+            print("Dry run: skipping cluster connectivity check (existence checks are read-only)")
+            return
+
         try:
-            self.k8s_client.get_api_resources()
+            # /version is a few hundred bytes, unlike the full API discovery document
+            client.VersionApi().get_code()
             print(f"Connected to Kubernetes cluster")
         except Exception as e:
             print(f"Error: Could not connect to Kubernetes cluster: {e}")
             sys.exit(1)
 
+    @staticmethod
+    def _load_kube_config() -> None:
+        """Load kubeconfig, falling back to in-cluster config."""
+        try:
+            config.load_kube_config()
+            print("Loaded kubeconfig")
+        except config.config_exception.ConfigException:
+            config.load_incluster_config()
+            print("Loaded in-cluster config")
+
+    @cached_property
+    def _dry_run_can_read(self) -> bool:
+        """Whether dry-run existence checks can reach the cluster (loaded once)."""
+        try:
+            self._load_kube_config()
+            return True
+        except Exception as e:
+            print(f"[DRY RUN] Cannot read cluster state, existence not checked: {e}")
+            return False
+
+    def _dry_run_exists(self, check: Callable[[], bool], what: str) -> Optional[bool]:
+        """Read-only existence check for dry-run reporting; None if it can't be made."""
+        if not self._dry_run_can_read:
+            return None
+        try:
+            return check()
+        except Exception as e:
+            print(f"[DRY RUN] Could not check whether {what} exists: {e}")
+            return None
+
+    @cached_property
+    def k8s_client(self) -> "client.CoreV1Api":
+        """CoreV1 API client, created on first use."""
+        return client.CoreV1Api()
+
     def _get_current_namespace(self) -> str:
         """Get the current namespace from kubectl context."""
         try:
@@ -100,7 +167,7 @@ class KubernetesSecretCreator:
 
             if active_context and 'context' in active_context:
                 context = active_context['context']
-                namespace = context.get('namespace', 'default')
+                namespace: str = context.get('namespace', 'default')
                 return namespace
 
             return 'default'
@@ -118,10 +185,9 @@ class KubernetesSecretCreator:
         print(f"Loading {config_file}...")
 
         try:
-            with open(config_file, 'r') as f:
-                config_data = json.load(f)
-                print(f"   Loaded configuration successfully")
-                return config_data
+            config_data = _load_json_cached(config_file)
+            print(f"   Loaded configuration successfully")
+            return config_data
         except Exception as e:
             print(f"Error: Failed to load config file: {e}")
             sys.exit(1)
@@ -141,7 +207,11 @@ class KubernetesSecretCreator:
         if self.namespace == "default":
             return True
 
-        if self.namespace_exists():
+        if self.dry_run:
+            exists = self._dry_run_exists(self.namespace_exists, f"namespace {self.namespace}")
+        else:
+            exists = self.namespace_exists()
+        if exists:
             print(f"Namespace {self.namespace} exists")
             return True
 
@@ -197,20 +267,10 @@ class KubernetesSecretCreator:
         labels: Optional[Dict[str, str]] = None,
         replace: bool = False
     ) -> bool:
-        """Create a Kubernetes secret."""
-        exists = self.secret_exists(name)
-
-        if exists:
-            if replace:
-                print(f"Secret {name} exists, replacing...")
-                if not self.dry_run:
-                    self.delete_secret(name)
-            else:
-                print(f"Warning: Secret {name} already exists (use --replace to update)")
-                return False
-
+        """Create a Kubernetes secret (or replace an existing one if replace)."""
+        b2a = binascii.b2a_base64
         encoded_data = {
-            k: base64.b64encode(v.encode()).decode()
+            k: b2a(v.encode(), newline=False).decode("ascii")
             for k, v in data.items()
         }
 
@@ -234,31 +294,75 @@ class KubernetesSecretCreator:
         )
 
         if self.dry_run:
-            print(f"[DRY RUN] Would create secret: {name}")
+            exists = self._dry_run_exists(partial(self.secret_exists, name), f"secret {name}")
+            if exists and not replace:
+                print(f"Warning: Secret {name} already exists (use --replace to update)")
+                return False
+            if exists is None:
+                action = "create or replace" if replace else "create"
+            else:
+                action = "replace" if exists else "create"
+            print(f"[DRY RUN] Would {action} secret: {name}")
             print(f"   Namespace: {self.namespace}")
             print(f"   Data keys: {', '.join(data.keys())}")
             return True
 
         try:
-            print(f"Creating secret: {name}")
-            self.k8s_client.create_namespaced_secret(
-                namespace=self.namespace,
-                body=secret
-            )
-            print(f"Created secret: {name}")
+            if replace:
+                # A full PUT drops keys and labels the new secret no longer has,
+                # like the old delete-and-recreate, without a separate
+                # existence check; only a missing secret needs a second request
+                print(f"Replacing secret: {name}")
+                try:
+                    self.k8s_client.replace_namespaced_secret(
+                        name=name,
+                        namespace=self.namespace,
+                        body=secret
+                    )
+                    print(f"Replaced secret: {name}")
+                except ApiException as e:
+                    if e.status == 422:
+                        # Immutable fields (type, immutable: true) can't be
+                        # changed in place; recreate the secret instead
+                        self.k8s_client.delete_namespaced_secret(
+                            name=name,
+                            namespace=self.namespace,
+                            body=client.V1DeleteOptions()
+                        )
+                    elif e.status != 404:
+                        raise
+                    self.k8s_client.create_namespaced_secret(
+                        namespace=self.namespace,
+                        body=secret
+                    )
+                    print(f"Created secret: {name}")
+            else:
+                print(f"Creating secret: {name}")
+                self.k8s_client.create_namespaced_secret(
+                    namespace=self.namespace,
+                    body=secret
+                )
+                print(f"Created secret: {name}")
             print(f"   Keys: {', '.join(data.keys())}")
             return True
         except ApiException as e:
+            if e.status == 409:
+                print(f"Warning: Secret {name} already exists (use --replace to update)")
+                return False
             print(f"Error: Failed to create secret: {e.reason}")
             return False
 
 
-def main():
-    """Main entry point."""
-    parser = argparse.ArgumentParser(
-        description="Create all Kubernetes secrets for MCP Server deployment",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+def _secret_result(future: "Future[bool]") -> bool:
+    """Result of a create_secret call, reporting rather than raising its errors."""
+    try:
+        return future.result()
+    except Exception as e:
+        print(f"Error: Failed to create secret: {e}")
+        return False
+
+
+EPILOG = """
 Examples:
   # Create all secrets
   python create-secrets.py --namespace default --release-name my-release
@@ -269,6 +373,9 @@ Examples:
   # Force replace existing secrets
   python create-secrets.py --namespace default --release-name my-release --force
 
+  # Create both secrets concurrently
+  python create-secrets.py --namespace default --release-name my-release --parallel
+
 Secrets Created:
   1. <release-name>-auth0-credentials
      - server-client-id: Server client ID (for FastMCP)
@@ -281,7 +388,15 @@ Secrets Created:
   2. <release-name>-jwt-signing-key
      - jwt-signing-key: JWT signing key for MCP tokens (256-bit hex)
      - storage-encryption-key: Fernet key for OAuth token encryption (base64)
-        """
+"""
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser."""
+    parser = argparse.ArgumentParser(
+        description="Create all Kubernetes secrets for MCP Server deployment",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=EPILOG
     )
 
     parser.add_argument(
@@ -303,6 +418,11 @@ Secrets Created:
         action="store_true",
         help="Force replace secrets if they already exist"
     )
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Create both secrets concurrently (output may interleave)"
+    )
     parser.add_argument(
         "--release-name",
         help="Helm release name (used to generate secret name)",
@@ -314,8 +434,21 @@ Secrets Created:
         default="mcp-server"
     )
 
+    return parser
+
+
+def main():
+    """Main entry point."""
+    parser = _build_parser()
     args = parser.parse_args()
 
+    # Generate key material in the background while we talk to the cluster
+    keygen_executor = ThreadPoolExecutor(max_workers=1)
+    keygen_future = keygen_executor.submit(
+        lambda: (generate_jwt_signing_key(), generate_storage_encryption_key())
+    )
+    keygen_executor.shutdown(wait=False)
+
     print("=" * 70)
     print("Kubernetes Secret Creator for MCP Server")
     print("=" * 70)
@@ -397,43 +530,51 @@ Secrets Created:
 
     print()
 
-    success = True
     secret_name = f"{args.release_name}-auth0-credentials"
+    jwt_secret_name = f"{args.release_name}-jwt-signing-key"
 
-    if not creator.create_secret(
-        name=secret_name,
-        data=mgmt_data,
-        labels={"component": "auth0-credentials"},
-        replace=args.force
-    ):
-        success = False
-    print()
+    def create(name: str, data: Dict[str, str], component: str) -> bool:
+        created: bool = creator.create_secret(
+            name=name,
+            data=data,
+            labels={"component": component},
+            replace=args.force
+        )
+        return created
+
+    results = []
+    if not args.parallel:
+        results.append(create(secret_name, mgmt_data, "auth0-credentials"))
+        print()
 
     print("=" * 70)
     print("Creating JWT Signing Key and Storage Encryption Key Secret")
     print("=" * 70)
     print()
 
-    jwt_key = generate_jwt_signing_key()
-    storage_key = generate_storage_encryption_key()
+    jwt_key, storage_key = keygen_future.result()
 
     print(f"Generated JWT signing key: {jwt_key[:16]}...{jwt_key[-16:]}")
     print(f"Generated storage encryption key: {storage_key[:16]}...{storage_key[-16:]}")
     print()
 
-    jwt_secret_name = f"{args.release_name}-jwt-signing-key"
     jwt_secret_data = {
         "jwt-signing-key": jwt_key,
         "storage-encryption-key": storage_key.decode()
     }
 
-    if not creator.create_secret(
-        name=jwt_secret_name,
-        data=jwt_secret_data,
-        labels={"component": "jwt-signing-key"},
-        replace=args.force
-    ):
-        success = False
+    if args.parallel:
+        # Overlap the two API round trips
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(create, secret_name, mgmt_data, "auth0-credentials"),
+                executor.submit(create, jwt_secret_name, jwt_secret_data, "jwt-signing-key"),
+            ]
+            # Collect every result first so each failure gets reported
+            results = [_secret_result(f) for f in futures]
+    else:
+        results.append(create(jwt_secret_name, jwt_secret_data, "jwt-signing-key"))
+    success = all(results)
     print()
 
     print("=" * 70)
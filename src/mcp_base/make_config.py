@@ -23,24 +23,37 @@ Usage:
 
 import os
 import sys
-import json
-import re
 import argparse
+import functools
+import getpass
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Mapping
 from urllib.parse import urlparse
 
+from mcp_base._atomic import write_atomic
+from mcp_base._json import dumps
+
 
 def to_snake_case(name: str) -> str:
     """Convert a name to snake_case."""
-    # Replace spaces and hyphens with underscores
-    s = re.sub(r'[\s\-]+', '_', name)
-    # Insert underscore before uppercase letters and lowercase them
-    s = re.sub(r'([A-Z])', r'_\1', s).lower()
-    # Remove leading underscore and collapse multiple underscores
-    s = re.sub(r'^_+', '', s)
-    s = re.sub(r'_+', '_', s)
-    return s
+    out: List[str] = []
+    for c in name:
+        # Spaces and hyphens become underscores; an uppercase letter gets one
+        # in front. Leading and repeated underscores are dropped as we go.
+        if c == '_' or c == '-' or c.isspace():
+            if out and out[-1] != '_':
+                out.append('_')
+            continue
+        if 'A' <= c <= 'Z' and out and out[-1] != '_':
+            out.append('_')
+        out.append(c)
+    return ''.join(out).lower()
+
+
+@functools.cache
+def _stdin_is_tty() -> bool:
+    """Whether prompts can be shown; checked once instead of once per field."""
+    return sys.stdin.isatty()
 
 
 def get_env_or_prompt(
@@ -48,10 +61,11 @@ def get_env_or_prompt(
     prompt: str,
     required: bool = True,
     default: Optional[str] = None,
-    secret: bool = False
+    secret: bool = False,
+    env: Optional[Mapping[str, str]] = None
 ) -> Optional[str]:
-    """Get value from environment variable or prompt user."""
-    value = os.environ.get(env_var)
+    """Get value from environment variable (or the given env mapping) or prompt user."""
+    value = (os.environ if env is None else env).get(env_var)
     if value:
         if secret:
             print(f"  {prompt}: ******* (from {env_var})")
@@ -59,13 +73,12 @@ def get_env_or_prompt(
             print(f"  {prompt}: {value} (from {env_var})")
         return value
 
-    if sys.stdin.isatty():
+    if _stdin_is_tty():
         if default:
             user_input = input(f"  {prompt} [{default}]: ").strip()
             return user_input if user_input else default
         else:
             if secret:
-                import getpass
                 return getpass.getpass(f"  {prompt}: ")
             else:
                 user_input = input(f"  {prompt}: ").strip()
@@ -84,14 +97,25 @@ def validate_domain(domain: str) -> bool:
     if not domain:
         return False
     # Should be like: your-tenant.auth0.com or your-tenant.us.auth0.com
-    if '.auth0.com' not in domain and '.auth0.co' not in domain:
+    # ('.auth0.co' also covers '.auth0.com')
+    if '.auth0.co' not in domain:
         print(f"    Warning: Domain '{domain}' doesn't look like an Auth0 domain")
         return True  # Allow custom domains
     return True
 
 
+# Characters urlparse strips or rejects, which the validate_url fast path can't judge
+_URL_FAST_PATH_UNSAFE = frozenset("[]\t\r\n")
+
+
 def validate_url(url: str, name: str) -> bool:
     """Validate URL format."""
+    # A plain http(s)://host... URL is valid without running the full parser
+    if (url.startswith(("https://", "http://")) and url.isascii()
+            and _URL_FAST_PATH_UNSAFE.isdisjoint(url)):
+        host_start = url.index("://") + 3
+        if url[host_start:host_start + 1] not in ("", "/", "?", "#"):
+            return True
     try:
         result = urlparse(url)
         if not all([result.scheme, result.netloc]):
@@ -103,6 +127,89 @@ def validate_url(url: str, name: str) -> bool:
         return False
 
 
+# Helm values written by generate_helm_values(); placeholders are filled with
+# str.format_map, so literal braces would need doubling
+_HELM_VALUES_TEMPLATE = """# {server_name} MCP Server - Helm Values
+# Generated by make-config.py
+# Use with: helm install {release_name} chart/ -f helm-values.yaml
+
+replicaCount: 1
+
+image:
+  repository: {image_name}
+  tag: latest
+  pullPolicy: IfNotPresent
+
+oidc:
+  issuer: "{issuer}"
+  audience: "{audience}"
+
+# Auth0 credentials - these will be read from Kubernetes secrets
+# Run: python create-secrets.py --namespace {namespace} --release-name {release_name}
+
+redis:
+  enabled: true
+  architecture: standalone
+  auth:
+    enabled: false
+
+service:
+  type: ClusterIP
+  port: {port}
+
+ingress:
+  enabled: false
+  # className: nginx
+  # hosts:
+  #   - host: {image_name}.example.com
+  #     paths:
+  #       - path: /
+  #         pathType: Prefix
+"""
+
+# .env written by generate_env_file(), filled the same way
+_ENV_TEMPLATE = """# {server_name} MCP Server - Environment Configuration
+# Generated by make-config.py
+# DO NOT commit this file to version control!
+
+# Auth0 Configuration
+OIDC_ISSUER={issuer}
+OIDC_AUDIENCE={audience}
+AUTH0_DOMAIN={domain}
+AUTH0_CLIENT_ID={client_id}
+AUTH0_CLIENT_SECRET={client_secret}
+
+# Kubernetes Configuration
+K8S_NAMESPACE={namespace}
+
+# Server Configuration
+PORT={port}
+
+# Redis Configuration (for local development)
+REDIS_URL=redis://localhost:6379/0
+"""
+
+# Written by generate_gitignore_entries(); only the heading line varies
+_GITIGNORE_HEADER = "# {} MCP Server - Sensitive files\n"
+_GITIGNORE_BODY = b"""# Add these lines to your .gitignore
+
+# Auth0 configuration (contains secrets)
+auth0-config.json
+
+# Environment files
+.env
+.env.local
+.env.*.local
+
+# Helm values with secrets
+helm-values.yaml
+
+# Token files
+*-token.txt
+*.token
+"""
+
+
 class ConfigGenerator:
     """Generate configuration files for MCP Server."""
 
@@ -112,58 +219,69 @@ class ConfigGenerator:
         server_name_snake: Optional[str] = None,
         default_port: int = 4208,
         default_namespace: str = "default",
-        output_dir: Path = Path(".")
+        output_dir: Path = Path("."),
+        env: Optional[Mapping[str, str]] = None
     ):
         self.server_name = server_name
         self.server_name_snake = server_name_snake or to_snake_case(server_name)
+        # Used for the image name and the release/audience defaults
+        self.server_name_kebab = self.server_name_snake.replace("_", "-")
         self.default_port = default_port
         self.default_namespace = default_namespace
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.config: Dict[str, Any] = {}
+        # Environment consulted by the collect_* prompts; a plain dict snapshot
+        # unless the caller supplies one (e.g. tests)
+        self.env: Mapping[str, str] = dict(os.environ) if env is None else env
 
     def collect_auth0_config(self, from_env: bool = False, args: Optional[argparse.Namespace] = None) -> Dict[str, Any]:
         """Collect Auth0 configuration."""
         print("\n=== Auth0 Configuration ===")
+        cli = vars(args) if args else {}
 
         # Domain
-        domain = args.domain if args and args.domain else None
+        domain = cli.get("domain")
         if not domain:
             domain = get_env_or_prompt(
                 "AUTH0_DOMAIN",
                 "Auth0 Domain (e.g., your-tenant.auth0.com)",
-                required=True
+                required=True,
+                env=self.env
             )
         validate_domain(domain)
 
         # Client ID
-        client_id = args.client_id if args and args.client_id else None
+        client_id = cli.get("client_id")
         if not client_id:
             client_id = get_env_or_prompt(
                 "AUTH0_CLIENT_ID",
                 "Auth0 Client ID",
-                required=True
+                required=True,
+                env=self.env
             )
 
         # Client Secret
-        client_secret = args.client_secret if args and args.client_secret else None
+        client_secret = cli.get("client_secret")
         if not client_secret:
             client_secret = get_env_or_prompt(
                 "AUTH0_CLIENT_SECRET",
                 "Auth0 Client Secret",
                 required=True,
-                secret=True
+                secret=True,
+                env=self.env
             )
 
         # API Audience
-        audience = args.audience if args and args.audience else None
+        audience = cli.get("audience")
         if not audience:
-            default_audience = f"https://{self.server_name_snake.replace('_', '-')}.example.com/mcp"
+            default_audience = f"https://{self.server_name_kebab}.example.com/mcp"
             audience = get_env_or_prompt(
                 "AUTH0_AUDIENCE",
                 "Auth0 API Audience",
                 required=True,
-                default=default_audience
+                default=default_audience,
+                env=self.env
             )
 
         # Build issuer URL
@@ -177,27 +295,34 @@ class ConfigGenerator:
             "issuer": issuer
         }
 
+    def _resolve_optional(
+        self, cli_value: Optional[str], env_var: str, prompt: str, default: str
+    ) -> Optional[str]:
+        """Resolve an optional setting from the CLI, environment, prompt or default."""
+        if cli_value:
+            return cli_value
+        if not self.env.get(env_var) and not _stdin_is_tty():
+            # Nothing to report or ask about; get_env_or_prompt would return the default
+            return default
+        return get_env_or_prompt(env_var, prompt, required=False, default=default, env=self.env)
+
     def collect_kubernetes_config(self, args: Optional[argparse.Namespace] = None) -> Dict[str, Any]:
         """Collect Kubernetes deployment configuration."""
         print("\n=== Kubernetes Configuration ===")
-
-        namespace = args.namespace if args and args.namespace else None
-        if not namespace:
-            namespace = get_env_or_prompt(
-                "K8S_NAMESPACE",
-                "Kubernetes Namespace",
-                required=False,
-                default=self.default_namespace
-            )
-
-        release_name = args.release_name if args and args.release_name else None
-        if not release_name:
-            release_name = get_env_or_prompt(
-                "HELM_RELEASE_NAME",
-                "Helm Release Name",
-                required=False,
-                default=self.server_name_snake.replace("_", "-")
-            )
+        cli = vars(args) if args else {}
+
+        namespace = self._resolve_optional(
+            cli.get("namespace"),
+            "K8S_NAMESPACE",
+            "Kubernetes Namespace",
+            self.default_namespace
+        )
+        release_name = self._resolve_optional(
+            cli.get("release_name"),
+            "HELM_RELEASE_NAME",
+            "Helm Release Name",
+            self.server_name_kebab
+        )
 
         return {
             "namespace": namespace,
@@ -214,11 +339,8 @@ class ConfigGenerator:
         }
 
         output_path = self.output_dir / "auth0-config.json"
-        with open(output_path, 'w') as f:
-            json.dump(config, f, indent=2)
-
-        # Set restrictive permissions
-        os.chmod(output_path, 0o600)
+        # Restrictive permissions are set before the file appears
+        write_atomic(output_path, dumps(config, pretty=True), mode=0o600)
 
         print(f"\n  Created: {output_path}")
         print(f"    Permissions: 600 (owner read/write only)")
@@ -226,33 +348,20 @@ class ConfigGenerator:
 
     def generate_env_file(self, auth0_config: Dict[str, Any], k8s_config: Dict[str, Any]) -> Path:
         """Generate .env file for local development."""
-        env_content = f'''# {self.server_name} MCP Server - Environment Configuration
-# Generated by make-config.py
-# DO NOT commit this file to version control!
-
-# Auth0 Configuration
-OIDC_ISSUER={auth0_config["issuer"]}
-OIDC_AUDIENCE={auth0_config["audience"]}
-AUTH0_DOMAIN={auth0_config["domain"]}
-AUTH0_CLIENT_ID={auth0_config["client_id"]}
-AUTH0_CLIENT_SECRET={auth0_config["client_secret"]}
-
-# Kubernetes Configuration
-K8S_NAMESPACE={k8s_config["namespace"]}
-
-# Server Configuration
-PORT={self.default_port}
-
-# Redis Configuration (for local development)
-REDIS_URL=redis://localhost:6379/0
-'''
+        env_content = _ENV_TEMPLATE.format_map({
+            "server_name": self.server_name,
+            "issuer": auth0_config["issuer"],
+            "audience": auth0_config["audience"],
+            "domain": auth0_config["domain"],
+            "client_id": auth0_config["client_id"],
+            "client_secret": auth0_config["client_secret"],
+            "namespace": k8s_config["namespace"],
+            "port": self.default_port,
+        })
 
         output_path = self.output_dir / ".env"
-        with open(output_path, 'w') as f:
-            f.write(env_content)
-
-        # Set restrictive permissions
-        os.chmod(output_path, 0o600)
+        # Restrictive permissions are set before the file appears
+        write_atomic(output_path, env_content.encode(), mode=0o600)
 
         print(f"  Created: {output_path}")
         print(f"    Permissions: 600 (owner read/write only)")
@@ -260,83 +369,36 @@ REDIS_URL=redis://localhost:6379/0
 
     def generate_helm_values(self, auth0_config: Dict[str, Any], k8s_config: Dict[str, Any]) -> Path:
         """Generate custom Helm values file."""
-        image_name = self.server_name_snake.replace("_", "-")
-        values_content = f'''# {self.server_name} MCP Server - Helm Values
-# Generated by make-config.py
-# Use with: helm install {k8s_config["release_name"]} chart/ -f helm-values.yaml
-
-replicaCount: 1
-
-image:
-  repository: {image_name}
-  tag: latest
-  pullPolicy: IfNotPresent
-
-oidc:
-  issuer: "{auth0_config["issuer"]}"
-  audience: "{auth0_config["audience"]}"
-
-# Auth0 credentials - these will be read from Kubernetes secrets
-# Run: python create-secrets.py --namespace {k8s_config["namespace"]} --release-name {k8s_config["release_name"]}
-
-redis:
-  enabled: true
-  architecture: standalone
-  auth:
-    enabled: false
-
-service:
-  type: ClusterIP
-  port: {self.default_port}
-
-ingress:
-  enabled: false
-  # className: nginx
-  # hosts:
-  #   - host: {image_name}.example.com
-  #     paths:
-  #       - path: /
-  #         pathType: Prefix
-'''
+        values_content = _HELM_VALUES_TEMPLATE.format_map({
+            "server_name": self.server_name,
+            "release_name": k8s_config["release_name"],
+            "namespace": k8s_config["namespace"],
+            "image_name": self.server_name_kebab,
+            "issuer": auth0_config["issuer"],
+            "audience": auth0_config["audience"],
+            "port": self.default_port,
+        })
 
         output_path = self.output_dir / "helm-values.yaml"
-        with open(output_path, 'w') as f:
-            f.write(values_content)
+        write_atomic(output_path, values_content.encode())
 
         print(f"  Created: {output_path}")
         return output_path
 
     def generate_gitignore_entries(self) -> Path:
         """Generate .gitignore entries for config files."""
-        gitignore_content = f'''# {self.server_name} MCP Server - Sensitive files
-# Add these lines to your .gitignore
-
-# Auth0 configuration (contains secrets)
-auth0-config.json
-
-# Environment files
-.env
-.env.local
-.env.*.local
-
-# Helm values with secrets
-helm-values.yaml
-
-# Token files
-*-token.txt
-*.token
-'''
+        gitignore_content = _GITIGNORE_HEADER.format(self.server_name).encode() + _GITIGNORE_BODY
 
         output_path = self.output_dir / "gitignore-additions.txt"
-        with open(output_path, 'w') as f:
-            f.write(gitignore_content)
+        write_atomic(output_path, gitignore_content)
 
         print(f"  Created: {output_path}")
         print(f"    Add these entries to your .gitignore file")
         return output_path
 
 
-def main():
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser."""
     parser = argparse.ArgumentParser(
         description="Generate configuration files for MCP Server deployment",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -423,7 +485,11 @@ Examples:
         help="Skip generating helm-values.yaml"
     )
 
-    args = parser.parse_args()
+    return parser
+
+
+def main():
+    args = _build_parser().parse_args()
 
     print(f"=== {args.server_name} Configuration Generator ===")
 
@@ -24,16 +24,53 @@ Usage:
 
 import os
 import sys
-import json
 import argparse
-import requests
-from typing import Dict, Any, List, Optional, Tuple
-from urllib.parse import urlparse
+import functools
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Optional, Tuple, cast
+from urllib.parse import ParseResult, urlparse
 from pathlib import Path
 
+from mcp_base import __version__
+from mcp_base._atomic import write_atomic
+from mcp_base._json import dumps, loads
+from mcp_base._token_cache import clear_cached_token, get_cached_token, save_cached_token
+
+if TYPE_CHECKING:
+    import requests
+
 
 DEFAULT_CONFIG_FILE = "auth0-config.json"
 
+# Fields requested from list endpoints; only these are read from the responses
+_CLIENT_FIELDS = "client_id,name,app_type,callbacks,web_origins,allowed_origins,grant_types"
+_RESOURCE_SERVER_FIELDS = "id,identifier,name,scopes"
+
+# Release image tags (v1.2.3...) use pullPolicy IfNotPresent in generated Helm values
+_RELEASE_TAG_RE = re.compile(r'^v\d+\.\d+\.\d+')
+
+# Test-harness client origins: test/get-user-token.py and its alternate port
+_LOCAL_ORIGINS = ("http://localhost:8888", "http://localhost:8889")
+_CLAUDE_ORIGIN = "https://claude.ai"
+_CLAUDE_CALLBACK = "https://claude.ai/api/mcp/auth_callback"
+
+# Display names for connection strategies shown by list_connections()
+_STRATEGY_LABELS = {
+    "auth0": "Database",
+    "google-oauth2": "Google",
+    "github": "GitHub",
+    "facebook": "Facebook",
+    "twitter": "Twitter",
+    "windowslive": "Microsoft",
+    "linkedin": "LinkedIn"
+}
+
+# Short-lived credentials that are never written to the config file
+_UNSAVED_KEYS = frozenset(['token', 'mgmt_token'])
+
 
 class ConfigManager:
     """Manages configuration from multiple sources with precedence."""
@@ -45,8 +82,8 @@ class ConfigManager:
     def load_config(self) -> Dict[str, Any]:
         if os.path.exists(self.config_file):
             try:
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
+                with open(self.config_file, 'rb') as f:
+                    config = loads(f.read())
                 print(f"📄 Loaded configuration from {self.config_file}")
                 return config
             except Exception as e:
@@ -56,23 +93,18 @@ class ConfigManager:
     
     def save_config(self, config: Dict[str, Any]) -> None:
         """Save config but preserve sensitive data if not provided."""
-        existing_config = self.config.copy()
-        
+        # Merge into self.config so it keeps matching what is on disk
         for key, value in config.items():
             if value:
-                existing_config[key] = value
-        
-        safe_config = {
-            k: v for k, v in existing_config.items() 
-            if k not in ['token', 'mgmt_token']
-        }
+                self.config[key] = value
+
+        safe_config = {k: v for k, v in self.config.items() if k not in _UNSAVED_KEYS}
         
         try:
             config_dir = os.path.dirname(self.config_file)
             if config_dir:  # Only create directory if path includes one
                 os.makedirs(config_dir, exist_ok=True)
-            with open(self.config_file, 'w') as f:
-                json.dump(safe_config, f, indent=2)
+            write_atomic(self.config_file, dumps(safe_config, pretty=True))
             print(f"💾 Configuration saved to {self.config_file}")
         except Exception as e:
             print(f"⚠️  Could not save config file: {e}")
@@ -95,9 +127,16 @@ class ConfigManager:
         return default
     
     def show_sources(self, config: Dict[str, Any]) -> None:
-        print("\n📋 Configuration Sources:")
-        print("-" * 60)
-        
+        env_var_map = {
+            'domain': 'AUTH0_DOMAIN',
+            'token': 'AUTH0_MGMT_TOKEN',
+            'api_name': 'AUTH0_API_NAME',
+            'api_identifier': 'AUTH0_API_IDENTIFIER',
+            'client_secret': 'AUTH0_MGMT_CLIENT_SECRET'
+        }
+        row = "  {:20} = {:30} [{}]"
+        lines = ["\n📋 Configuration Sources:", "-" * 60]
+
         for key, value in config.items():
             if key in ['token', 'mgmt_token', 'client_secret']:
                 display_value = "***hidden***"
@@ -109,32 +148,183 @@ class ConfigManager:
             source = "unknown"
             if key in self.config:
                 source = f"config file"
-            
-            env_var_map = {
-                'domain': 'AUTH0_DOMAIN',
-                'token': 'AUTH0_MGMT_TOKEN',
-                'api_name': 'AUTH0_API_NAME',
-                'api_identifier': 'AUTH0_API_IDENTIFIER',
-                'client_secret': 'AUTH0_MGMT_CLIENT_SECRET'
-            }
+
             if key in env_var_map and os.getenv(env_var_map[key]):
                 source = f"env: {env_var_map[key]}"
-            
-            print(f"  {key:20} = {display_value:30} [{source}]")
+
+            lines.append(row.format(key, display_value, source))
+
+        print("\n".join(lines))
+
+
+def _is_conflict(error: Exception) -> bool:
+    """True if a Management API call failed because the resource already exists."""
+    import requests
+
+    return (
+        isinstance(error, requests.HTTPError)
+        and error.response is not None
+        and error.response.status_code == 409
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_audience(api_identifier: str) -> ParseResult:
+    """urlparse() the API audience once; clients and Helm values all derive from it."""
+    return urlparse(api_identifier)
+
+
+def _mcp_server_urls(api_identifier: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Return (origin, FastMCP callback URL) of the MCP server behind an audience.
+
+    e.g. "https://cnpg-claude.wat.im/mcp" -> ("https://cnpg-claude.wat.im",
+    "https://cnpg-claude.wat.im/auth/callback"); (None, None) if it has no host.
+    """
+    parsed = _parse_audience(api_identifier)
+    if not parsed.netloc:
+        return None, None
+    base_url = f"{parsed.scheme}://{parsed.netloc}"
+    # FastMCP uses /auth/callback as the redirect path (see src/auth_fastmcp.py:214)
+    return base_url, f"{base_url}/auth/callback"
+
+
+def create_session() -> "requests.Session":
+    """
+    Create a keep-alive session for talking to one Auth0 tenant.
+
+    Every call in a run goes to the same host, so a single pooled connection
+    is reused instead of paying a TLS handshake per request. POST is not
+    retried since client/grant creation is not idempotent.
+    """
+    # Imported here so --help and early config errors don't pay for requests
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 502, 503, 504],
+                allowed_methods=frozenset(["GET", "PATCH", "DELETE"]),
+                raise_on_status=False
+            )
+        )
+    )
+    session.headers.update({"Accept": "application/json", "User-Agent": f"mcp-base/{__version__}"})
+    return session
+
+
+@dataclass(frozen=True)
+class ResolvedSecrets:
+    """
+    Client IDs and secrets from a saved auth0-config.json.
+
+    Resolved once from either layout: the nested sections written by
+    save_output_files (management_api.client_secret, ...) take precedence
+    over the older flat keys (mgmt_client_id, client_secret).
+    """
+    mgmt_client_id: str = ""
+    mgmt_client_secret: str = ""
+    server_client_id: str = ""
+    server_client_secret: str = ""
+    test_client_id: str = ""
+    connection_id: str = ""
+    api_identifier: str = ""
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ResolvedSecrets":
+        def section(name: str) -> Dict[str, Any]:
+            value = config.get(name)
+            return value if isinstance(value, dict) else {}
+
+        mgmt = section('management_api')
+        server = section('server_client')
+        return cls(
+            mgmt_client_id=mgmt.get('client_id') or config.get('mgmt_client_id') or "",
+            mgmt_client_secret=mgmt.get('client_secret') or config.get('client_secret') or "",
+            server_client_id=server.get('client_id') or "",
+            server_client_secret=server.get('client_secret') or "",
+            test_client_id=section('test_client').get('client_id') or "",
+            connection_id=config.get('connection_id') or "",
+            api_identifier=config.get('api_identifier') or config.get('audience') or "",
+        )
 
 
 class Auth0MCPSetup:
     """Handles complete Auth0 tenant setup for MCP with DCR."""
     
-    def __init__(self, domain: str, access_token: str):
+    def __init__(
+        self,
+        domain: str,
+        access_token: str,
+        session: Optional["requests.Session"] = None,
+        token_client_id: Optional[str] = None,
+        token_refresher: Optional[Callable[[], Optional[str]]] = None
+    ):
         self.domain = domain.rstrip('/')
         self.access_token = access_token
+        # Management client the token was minted for, if it came from (or went
+        # into) the token cache; a rejected token is evicted from the cache
+        self.token_client_id = token_client_id
+        # Mints a new token when a cached one is rejected; used at most once
+        self._token_refresher = token_refresher
         self.base_url = f"https://{self.domain}/api/v2"
         self.headers = {
             "Authorization": f"Bearer {self.access_token}",
             "Content-Type": "application/json"
         }
-        
+
+        # One keep-alive session for every Management API call in the run
+        # (shared with the token request when main() passes it in)
+        self._session = session or create_session()
+        self._session.headers.update(self.headers)
+
+        # Per-run memo of GET /clients and /resource-servers listings, keyed on
+        # (endpoint, params); writes to a collection drop its entries
+        self._cache: Dict[Tuple[str, frozenset], Any] = {}
+
+        # prefetch() runs requests on worker threads; only one of them should
+        # print the rejected-token guidance
+        self._auth_lock = threading.Lock()
+        self._auth_reported = False
+
+    def close(self) -> None:
+        """Close the underlying HTTP session."""
+        self._session.close()
+
+    def _refresh_token(self, rejected_token: str) -> bool:
+        """
+        Replace a rejected (cached) token with a newly minted one.
+
+        Returns True if the request should be retried with the current token:
+        either a new one was obtained, or another thread already replaced the
+        rejected one. Only one refresh is attempted per run.
+        """
+        with self._auth_lock:
+            if self.access_token != rejected_token:
+                return True
+            refresher, self._token_refresher = self._token_refresher, None
+            if refresher is None:
+                return False
+
+            print("   Cached management API token rejected, requesting a new one...")
+            if self.token_client_id:
+                clear_cached_token(self.domain, self.token_client_id)
+            token = refresher()
+            if not token:
+                return False
+            self.access_token = token
+            self.headers["Authorization"] = f"Bearer {token}"
+            self._session.headers["Authorization"] = f"Bearer {token}"
+            return True
+
     def _make_request(
         self,
         method: str,
@@ -143,79 +333,215 @@ class Auth0MCPSetup:
         params: Optional[Dict[str, Any]] = None,
         silent_errors: bool = False
     ) -> Dict[str, Any]:
+        import requests  # loaded by create_session() already
+
         url = f"{self.base_url}{endpoint}"
+        token = self.access_token
 
         try:
-            response = requests.request(
+            response = self._session.request(
                 method=method,
                 url=url,
-                headers=self.headers,
                 json=data,
                 params=params,
                 timeout=30
             )
             response.raise_for_status()
 
+            if method != "GET":
+                self._invalidate(endpoint)
+
             if response.status_code == 204:
                 return {}
 
             return response.json()
 
         except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 401:
+                if self._refresh_token(token):
+                    return self._make_request(method, endpoint, data, params, silent_errors)
+                self._handle_401(e)
             if not silent_errors:
                 print(f"❌ API request failed: {e}")
                 if e.response is not None:
                     print(f"Response: {e.response.text}")
             raise
 
-    def validate_token(self) -> bool:
+    @staticmethod
+    def _cache_key(endpoint: str, params: Optional[Dict[str, Any]]) -> Tuple[str, frozenset]:
+        return (endpoint, frozenset(params.items() if params else ()))
+
+    def _get_cached(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        silent_errors: bool = False
+    ) -> Any:
+        """GET a collection, reusing the response if it was already fetched this run."""
+        key = self._cache_key(endpoint, params)
+        if key not in self._cache:
+            self._cache[key] = self._make_request(
+                "GET", endpoint, params=params, silent_errors=silent_errors
+            )
+        return self._cache[key]
+
+    def _get_all(
+        self,
+        endpoint: str,
+        key: str,
+        fields: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        silent_errors: bool = False
+    ) -> List[Dict[str, Any]]:
+        """GET every page of a collection, asking only for the given fields (if any)."""
+        base_params = dict(params or {})
+        if fields:
+            base_params.update(fields=fields, include_fields="true")
+        cache_key = self._cache_key(endpoint, base_params)
+        if cache_key in self._cache:
+            return cast(List[Dict[str, Any]], self._cache[cache_key])
+
+        items: List[Dict[str, Any]] = []
+        page = 0
+        while True:
+            response = self._make_request(
+                "GET",
+                endpoint,
+                params={**base_params, "per_page": 100, "page": page, "include_totals": "true"},
+                silent_errors=silent_errors
+            )
+            batch = response.get(key, [])
+            items.extend(batch)
+            if not batch or len(items) >= response.get("total", 0):
+                break
+            page += 1
+
+        self._cache[cache_key] = items
+        return items
+
+    def _list_resource_servers(self, silent_errors: bool = False) -> List[Dict[str, Any]]:
+        """List all APIs (resource servers) in the tenant."""
+        return self._get_all(
+            "/resource-servers",
+            "resource_servers",
+            _RESOURCE_SERVER_FIELDS,
+            silent_errors=silent_errors
+        )
+
+    def _has_client_grant(self, client_id: str, audience: str) -> bool:
+        """Check the tenant's client grants (listed once per run) for a client/audience."""
+        grants = self._get_all("/client-grants", "client_grants", silent_errors=True)
+        return any(
+            g.get("client_id") == client_id and g.get("audience") == audience for g in grants
+        )
+
+    def _invalidate(self, endpoint: str) -> None:
+        """Forget cached responses for the collection an endpoint belongs to."""
+        collection = "/" + endpoint.lstrip("/").split("/", 1)[0]
+        stale = [k for k in self._cache if k[0] == collection or k[0].startswith(collection + "/")]
+        for key in stale:
+            del self._cache[key]
+
+    def _list_clients(self, silent_errors: bool = False) -> List[Dict[str, Any]]:
+        """List all clients (applications) in the tenant."""
+        return self._get_all("/clients", "clients", _CLIENT_FIELDS, silent_errors=silent_errors)
+
+    def _find_client_by_name(
+        self, name: str, app_type: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
         """
-        Validate that the access token is valid and not expired.
-        Makes a simple API call to check token validity.
-        Raises an exception with a clear message if token is invalid/expired.
+        Find a client by exact name (and app type, if given).
+
+        /clients has no name search, so this scans the full paged client list,
+        which is fetched once per run and shared by every lookup.
         """
-        try:
-            # Make a simple GET request to verify token
-            self._make_request("GET", "/clients", params={"per_page": 1}, silent_errors=True)
-            return True
-        except requests.HTTPError as e:
-            if e.response is not None and e.response.status_code == 401:
-                error_body = {}
-                try:
-                    error_body = e.response.json()
-                except:
-                    pass
-
-                error_msg = error_body.get('message', 'Unauthorized')
-
-                # Check if it's an expired token
-                if 'expired' in error_msg.lower():
-                    print("\n" + "=" * 70)
-                    print("❌ TOKEN EXPIRED")
-                    print("=" * 70)
-                    print(f"Error: {error_msg}")
-                    print("\nYour Auth0 management API token has expired.")
-                    print("\nTo fix this:")
-                    print("  1. Generate a new token at:")
-                    print(f"     https://{self.domain}/dashboard/settings/tenant")
-                    print("  2. Rerun this script with --token YOUR_NEW_TOKEN")
-                    print("\nAlternatively, run without --token to auto-generate one.")
-                    print("=" * 70)
-                else:
-                    print("\n" + "=" * 70)
-                    print("❌ AUTHENTICATION FAILED")
-                    print("=" * 70)
-                    print(f"Error: {error_msg}")
-                    print("\nYour Auth0 management API token is invalid or lacks required permissions.")
-                    print("\nTo fix this:")
-                    print("  1. Verify your token at:")
-                    print(f"     https://{self.domain}/dashboard/settings/tenant")
-                    print("  2. Ensure the token has 'read:clients' and 'create:clients' scopes")
-                    print("  3. Rerun this script with a valid token")
-                    print("=" * 70)
+        return next(
+            (
+                c for c in self._list_clients()
+                if c.get("name") == name and (app_type is None or c.get("app_type") == app_type)
+            ),
+            None
+        )
+
+    def _handle_401(self, error: "requests.HTTPError") -> None:
+        """
+        Report a rejected management token and exit.
+
+        There is no separate validation probe; the first API call that gets a
+        401 ends up here and explains whether the token expired or is invalid.
+        """
+        error_body: Dict[str, Any] = {}
+        if error.response is not None:
+            try:
+                error_body = error.response.json()
+            except ValueError:
+                pass
 
+        error_msg = error_body.get('message', 'Unauthorized')
+
+        with self._auth_lock:
+            if self._auth_reported:
                 raise SystemExit(1)
-            raise
+            self._auth_reported = True
+
+        if self.token_client_id:
+            clear_cached_token(self.domain, self.token_client_id)
+
+        # Check if it's an expired token
+        if 'expired' in error_msg.lower():
+            lines = [
+                "\n" + "=" * 70,
+                "❌ TOKEN EXPIRED",
+                "=" * 70,
+                f"Error: {error_msg}",
+                "\nYour Auth0 management API token has expired.",
+                "\nTo fix this:",
+                "  1. Generate a new token at:",
+                f"     https://{self.domain}/dashboard/settings/tenant",
+                "  2. Rerun this script with --token YOUR_NEW_TOKEN",
+                "\nAlternatively, run without --token to auto-generate one.",
+                "=" * 70,
+            ]
+        else:
+            lines = [
+                "\n" + "=" * 70,
+                "❌ AUTHENTICATION FAILED",
+                "=" * 70,
+                f"Error: {error_msg}",
+                "\nYour Auth0 management API token is invalid or lacks required permissions.",
+                "\nTo fix this:",
+                "  1. Verify your token at:",
+                f"     https://{self.domain}/dashboard/settings/tenant",
+                "  2. Ensure the token has 'read:clients' and 'create:clients' scopes",
+                "  3. Rerun this script with a valid token",
+                "=" * 70,
+            ]
+        print("\n".join(lines))
+
+        raise SystemExit(1)
+
+    def prefetch(self) -> None:
+        """
+        Warm the lookup cache with the read-only calls the setup steps make.
+
+        The API, client grant and client listings don't depend on one another,
+        so they run concurrently; the steps that follow then find their answers
+        in the cache. Errors are left for those steps to report.
+        """
+        lookups = [
+            lambda: self._list_resource_servers(silent_errors=True),
+            lambda: self._get_all("/client-grants", "client_grants", silent_errors=True),
+            lambda: self._list_clients(silent_errors=True),
+        ]
+
+        with ThreadPoolExecutor(max_workers=len(lookups)) as executor:
+            futures = [executor.submit(lookup) for lookup in lookups]
+
+        for future in futures:
+            error = future.exception()
+            if isinstance(error, SystemExit):
+                # Rejected token (already reported by _handle_401)
+                raise error
 
     def check_dcr_enabled(self) -> bool:
         """Check if DCR is already enabled."""
@@ -264,7 +590,7 @@ class Auth0MCPSetup:
     def get_api(self, identifier: str) -> Optional[Dict[str, Any]]:
         """Get API by identifier if it exists."""
         try:
-            apis = self._make_request("GET", "/resource-servers", silent_errors=True)
+            apis = self._list_resource_servers(silent_errors=True)
             for api in apis:
                 if api.get("identifier") == identifier:
                     return api
@@ -317,15 +643,13 @@ class Auth0MCPSetup:
             raise
     
     def get_management_client(self, name: str) -> Optional[Dict[str, Any]]:
-        """Find existing management client by name."""
-        try:
-            clients = self._make_request("GET", "/clients", params={"app_type": "non_interactive"})
-            for client in clients:
-                if client.get("name") == name:
-                    return client
-            return None
-        except Exception:
-            return None
+        """
+        Find existing management client by name.
+
+        A failed lookup raises rather than returning None, so it can never
+        lead to a duplicate client being created.
+        """
+        return self._find_client_by_name(name, app_type="non_interactive")
     
     def delete_client(self, client_id: str) -> bool:
         """Delete a client."""
@@ -387,7 +711,7 @@ class Auth0MCPSetup:
             
             print("🔑 Granting Management API access...")
             
-            resource_servers = self._make_request("GET", "/resource-servers")
+            resource_servers = self._list_resource_servers()
             mgmt_api = None
             for rs in resource_servers:
                 if rs.get("identifier") == f"https://{self.domain}/api/v2/":
@@ -431,13 +755,15 @@ class Auth0MCPSetup:
 
                 try:
                     self._make_request("POST", f"/client-grants", data=grant_payload)
-                    print("✅ Granted Management API scopes:")
-                    print("   - Tenant settings: read, update")
-                    print("   - Resource servers (APIs): read, create, update, delete")
-                    print("   - Connections: read, update")
-                    print("   - Clients: read, create, update, delete (+ keys, summary)")
-                    print("   - Client grants: read, create, update, delete")
-                    print("   - Users: read, update (+ idp_tokens)")
+                    print("\n".join([
+                        "✅ Granted Management API scopes:",
+                        "   - Tenant settings: read, update",
+                        "   - Resource servers (APIs): read, create, update, delete",
+                        "   - Connections: read, update",
+                        "   - Clients: read, create, update, delete (+ keys, summary)",
+                        "   - Client grants: read, create, update, delete",
+                        "   - Users: read, update (+ idp_tokens)",
+                    ]))
                 except Exception:
                     print("✅ Permissions already configured")
             
@@ -457,9 +783,11 @@ class Auth0MCPSetup:
         """Create FastMCP OAuth server client for user authentication."""
         print(f"\n🔧 Setting up FastMCP Server Client: {name}...")
 
+        # Derive the MCP server origin and FastMCP callback once for both branches
+        mcp_base_url, mcp_callback = _mcp_server_urls(api_identifier)
+
         # Check if client exists
-        all_clients = self._make_request("GET", "/clients")
-        existing = next((c for c in all_clients if c.get("name") == name), None)
+        existing = self._find_client_by_name(name)
 
         if existing and recreate:
             print(f"🔄 Recreating server client (--recreate-client specified)...")
@@ -469,6 +797,9 @@ class Auth0MCPSetup:
             else:
                 print(f"⚠️  Could not delete existing client, will use it")
 
+        # A grant can only exist already if the client did
+        reused = existing is not None
+
         if existing:
             client_id = existing['client_id']
             print(f"✅ Server client already exists")
@@ -483,87 +814,68 @@ class Auth0MCPSetup:
                 client_secret = ""
 
             # Check and update callback URLs if needed
-            from urllib.parse import urlparse
-            parsed = urlparse(api_identifier)
-            mcp_base_url = f"{parsed.scheme}://{parsed.netloc}" if parsed.netloc else None
-
-            existing_callbacks = existing.get('callbacks', [])
+            existing_callbacks = existing.get('callbacks') or []
+            callbacks_set = set(existing_callbacks)
             missing_callbacks = []
 
-            if mcp_base_url:
-                mcp_callback = f"{mcp_base_url}/auth/callback"
-                if mcp_callback not in existing_callbacks:
-                    missing_callbacks.append(mcp_callback)
+            if mcp_callback and mcp_callback not in callbacks_set:
+                missing_callbacks.append(mcp_callback)
+
+            # Check grant types too, so both fixes go out in a single PATCH
+            existing_grant_types = existing.get('grant_types') or []
+            grant_types_set = set(existing_grant_types)
+            required_grant_types = ["authorization_code", "refresh_token", "client_credentials"]
+            missing_grant_types = [gt for gt in required_grant_types if gt not in grant_types_set]
+
+            patch_body: Dict[str, Any] = {}
 
             if missing_callbacks:
                 print(f"   📝 Updating callback URLs...")
-                updated_callbacks = existing_callbacks + missing_callbacks
+                web_origins = list(existing.get('web_origins') or [])
+                allowed_origins = list(existing.get('allowed_origins') or [])
+                web_origins_set = set(web_origins)
+                allowed_origins_set = set(allowed_origins)
 
-                web_origins = existing.get('web_origins', [])
-                allowed_origins = existing.get('allowed_origins', [])
-
-                if mcp_base_url and mcp_base_url not in web_origins:
-                    web_origins = web_origins + [mcp_base_url]
-                    allowed_origins = allowed_origins + [mcp_base_url]
+                if mcp_base_url and mcp_base_url not in web_origins_set:
+                    web_origins.append(mcp_base_url)
+                if mcp_base_url and mcp_base_url not in allowed_origins_set:
+                    allowed_origins.append(mcp_base_url)
 
-                try:
-                    self._make_request(
-                        "PATCH",
-                        f"/clients/{client_id}",
-                        data={
-                            "callbacks": updated_callbacks,
-                            "web_origins": web_origins,
-                            "allowed_origins": allowed_origins
-                        }
-                    )
-                    print(f"   ✅ Updated callback URLs:")
-                    for cb in missing_callbacks:
-                        print(f"      + {cb}")
-                except Exception as e:
-                    print(f"   ⚠️  Failed to update callbacks: {e}")
+                patch_body["callbacks"] = existing_callbacks + missing_callbacks
+                patch_body["web_origins"] = web_origins
+                patch_body["allowed_origins"] = allowed_origins
             else:
                 print(f"   ✅ Callback URLs already configured")
 
-            # Check and update grant types if needed
-            existing_grant_types = existing.get('grant_types', [])
-            required_grant_types = ["authorization_code", "refresh_token", "client_credentials"]
-            missing_grant_types = [gt for gt in required_grant_types if gt not in existing_grant_types]
-
             if missing_grant_types:
                 print(f"   📝 Updating grant types...")
-                updated_grant_types = list(set(existing_grant_types + missing_grant_types))
+                patch_body["grant_types"] = list(grant_types_set.union(missing_grant_types))
+            else:
+                print(f"   ✅ Grant types already configured")
 
+            if patch_body:
                 try:
-                    self._make_request(
-                        "PATCH",
-                        f"/clients/{client_id}",
-                        data={
-                            "grant_types": updated_grant_types
-                        }
-                    )
-                    print(f"   ✅ Updated grant types:")
-                    for gt in missing_grant_types:
-                        print(f"      + {gt}")
+                    self._make_request("PATCH", f"/clients/{client_id}", data=patch_body)
+                    if missing_callbacks:
+                        print(f"   ✅ Updated callback URLs:")
+                        for cb in missing_callbacks:
+                            print(f"      + {cb}")
+                    if missing_grant_types:
+                        print(f"   ✅ Updated grant types:")
+                        for gt in missing_grant_types:
+                            print(f"      + {gt}")
                 except Exception as e:
-                    print(f"   ⚠️  Failed to update grant types: {e}")
-            else:
-                print(f"   ✅ Grant types already configured")
+                    print(f"   ⚠️  Failed to update client settings: {e}")
         else:
             # Create new server client
             # FastMCP needs authorization_code for user authentication, not just client_credentials
             try:
-                # Extract base URL from api_identifier for callback configuration
-                from urllib.parse import urlparse
-                parsed = urlparse(api_identifier)
-                mcp_base_url = f"{parsed.scheme}://{parsed.netloc}" if parsed.netloc else None
-
                 # Build callback URLs for FastMCP OAuth flow
                 callbacks = []
                 web_origins = []
                 allowed_origins = []
 
-                if mcp_base_url:
-                    mcp_callback = f"{mcp_base_url}/auth/callback"
+                if mcp_callback:
                     callbacks.append(mcp_callback)
                     web_origins.append(mcp_base_url)
                     allowed_origins.append(mcp_base_url)
@@ -605,7 +917,7 @@ class Auth0MCPSetup:
         print(f"🔑 Granting access to API: {api_identifier}...")
         try:
             # Get API resource server
-            resource_servers = self._make_request("GET", "/resource-servers", silent_errors=True)
+            resource_servers = self._list_resource_servers(silent_errors=True)
             api = next((rs for rs in resource_servers if rs.get("identifier") == api_identifier), None)
 
             if not api:
@@ -619,20 +931,24 @@ class Auth0MCPSetup:
                     # If no scopes defined, just grant access without specific scopes
                     scopes = []
 
-                # Create client grant
+                # Create client grant unless the tenant already has it
                 try:
-                    grant_payload = {
-                        "client_id": client_id,
-                        "audience": api_identifier,
-                        "scope": scopes
-                    }
-
-                    self._make_request("POST", "/client-grants", data=grant_payload, silent_errors=True)
-                    print(f"✅ Granted API access")
-                    print(f"   Scopes: {', '.join(scopes) if scopes else 'all'}")
+                    if reused and self._has_client_grant(client_id, api_identifier):
+                        print("✅ API access already granted")
+                    else:
+                        grant_payload = {
+                            "client_id": client_id,
+                            "audience": api_identifier,
+                            "scope": scopes
+                        }
+
+                        self._make_request(
+                            "POST", "/client-grants", data=grant_payload, silent_errors=True
+                        )
+                        print(f"✅ Granted API access")
+                        print(f"   Scopes: {', '.join(scopes) if scopes else 'all'}")
                 except Exception as e:
-                    # Check if grant already exists (409 Conflict or "already exists" message)
-                    if "already exists" in str(e).lower() or "409" in str(e) or "conflict" in str(e).lower():
+                    if _is_conflict(e):
                         print("✅ API access already granted")
                     else:
                         print(f"⚠️  Could not create grant: {e}")
@@ -646,7 +962,6 @@ class Auth0MCPSetup:
     def create_test_client(
         self,
         api_identifier: str,
-        connection_id: Optional[str] = None,
         name: str = "MCP Test Client",
         existing_secret: Optional[str] = None,
         recreate: bool = False
@@ -658,22 +973,17 @@ class Auth0MCPSetup:
 
         Args:
             api_identifier: API audience identifier
-            connection_id: Auth0 connection ID to enable for this client
             name: Client name
             existing_secret: Not used for SPA clients (PKCE, no secret)
             recreate: Whether to recreate if exists
         """
         print(f"\n🧪 Setting up Test Harness Client: {name}...")
 
-        # Extract base URL from api_identifier for MCP server callbacks
-        # e.g., "https://cnpg-claude.wat.im/mcp" -> "https://cnpg-claude.wat.im"
-        from urllib.parse import urlparse
-        parsed = urlparse(api_identifier)
-        mcp_base_url = f"{parsed.scheme}://{parsed.netloc}" if parsed.netloc else None
+        # MCP server origin and FastMCP callback derived from api_identifier
+        mcp_base_url, mcp_callback = _mcp_server_urls(api_identifier)
 
         # Check if client exists
-        all_clients = self._make_request("GET", "/clients")
-        existing = next((c for c in all_clients if c.get("name") == name), None)
+        existing = self._find_client_by_name(name)
 
         if existing and recreate:
             print(f"🔄 Recreating user auth client (--recreate-client specified)...")
@@ -683,56 +993,51 @@ class Auth0MCPSetup:
             else:
                 print(f"⚠️  Could not delete existing client, will use it")
 
+        # A grant can only exist already if the client did
+        reused = existing is not None
+
         if existing:
             client_id = existing['client_id']
             print(f"✅ User auth client already exists")
             print(f"   Client ID: {client_id}")
 
             # Check and update callback URLs if missing
-            existing_callbacks = existing.get('callbacks', [])
+            existing_callbacks = existing.get('callbacks') or []
+            callbacks_set = set(existing_callbacks)
             missing_callbacks = []
 
             # Check for MCP server callback
-            # FastMCP uses /auth/callback as the redirect path (see src/auth_fastmcp.py:214)
-            if mcp_base_url:
-                mcp_callback = f"{mcp_base_url}/auth/callback"
-                if mcp_callback not in existing_callbacks:
-                    missing_callbacks.append(mcp_callback)
+            if mcp_callback and mcp_callback not in callbacks_set:
+                missing_callbacks.append(mcp_callback)
 
             # Check for Claude callback
-            claude_callback = "https://claude.ai/api/mcp/auth_callback"
-            if claude_callback not in existing_callbacks:
-                missing_callbacks.append(claude_callback)
+            if _CLAUDE_CALLBACK not in callbacks_set:
+                missing_callbacks.append(_CLAUDE_CALLBACK)
 
             if missing_callbacks:
                 print(f"   ⚠️  Missing callback URLs, updating client...")
                 updated_callbacks = existing_callbacks + missing_callbacks
 
                 # Also update web_origins and allowed_origins
-                existing_web_origins = existing.get('web_origins', [])
-                existing_allowed_origins = existing.get('allowed_origins', [])
-
-                updated_web_origins = existing_web_origins.copy()
-                updated_allowed_origins = existing_allowed_origins.copy()
-
-                if mcp_base_url and mcp_base_url not in updated_web_origins:
-                    updated_web_origins.append(mcp_base_url)
-                    updated_allowed_origins.append(mcp_base_url)
-
-                if "https://claude.ai" not in updated_web_origins:
-                    updated_web_origins.append("https://claude.ai")
-                    updated_allowed_origins.append("https://claude.ai")
+                updated_web_origins = list(existing.get('web_origins') or [])
+                updated_allowed_origins = list(existing.get('allowed_origins') or [])
+                web_origins_set = set(updated_web_origins)
+                allowed_origins_set = set(updated_allowed_origins)
+
+                for origin in (mcp_base_url, _CLAUDE_ORIGIN):
+                    if origin and origin not in web_origins_set:
+                        updated_web_origins.append(origin)
+                    if origin and origin not in allowed_origins_set:
+                        updated_allowed_origins.append(origin)
+
+                patch_body: Dict[str, Any] = {
+                    "callbacks": updated_callbacks,
+                    "web_origins": updated_web_origins,
+                    "allowed_origins": updated_allowed_origins
+                }
 
                 try:
-                    self._make_request(
-                        "PATCH",
-                        f"/clients/{client_id}",
-                        data={
-                            "callbacks": updated_callbacks,
-                            "web_origins": updated_web_origins,
-                            "allowed_origins": updated_allowed_origins
-                        }
-                    )
+                    self._make_request("PATCH", f"/clients/{client_id}", data=patch_body)
                     print(f"   ✅ Updated callback URLs:")
                     for cb in missing_callbacks:
                         print(f"      + {cb}")
@@ -743,38 +1048,23 @@ class Auth0MCPSetup:
         else:
             # Create new SPA client for user authentication
             try:
-                # Build callback URLs list
-                callbacks = [
-                    "http://localhost:8888/callback",  # For test/get-user-token.py
-                    "http://localhost:8889/callback",  # Alternate port
-                    "http://127.0.0.1:8888/callback",  # IPv4 explicit
-                ]
-
-                web_origins = [
-                    "http://localhost:8888",
-                    "http://localhost:8889",
-                ]
-
-                allowed_origins = [
-                    "http://localhost:8888",
-                    "http://localhost:8889",
-                ]
-
-                # Add MCP server callback URL for FastMCP OIDC proxy
-                # FastMCP uses /auth/callback as the redirect path (see src/auth_fastmcp.py:214)
-                if mcp_base_url:
-                    mcp_callback = f"{mcp_base_url}/auth/callback"
-                    callbacks.append(mcp_callback)
-                    web_origins.append(mcp_base_url)
-                    allowed_origins.append(mcp_base_url)
-                    print(f"   Adding MCP server callback: {mcp_callback}")
-
-                # Add Claude Desktop callback URL for third-party auth flow
-                claude_callback = "https://claude.ai/api/mcp/auth_callback"
-                callbacks.append(claude_callback)
-                web_origins.append("https://claude.ai")
-                allowed_origins.append("https://claude.ai")
-                print(f"   Adding Claude callback: {claude_callback}")
+                # Build callback URLs from the local test-harness origins
+                web_origins = list(_LOCAL_ORIGINS)
+                callbacks = [f"{origin}/callback" for origin in web_origins]
+                callbacks.append("http://127.0.0.1:8888/callback")  # IPv4 explicit
+
+                # Add the MCP server callback (FastMCP OIDC proxy) and the Claude
+                # Desktop callback (third-party auth flow)
+                extra: List[Tuple[str, str, str]] = []
+                if mcp_callback and mcp_base_url:
+                    extra.append(("MCP server", mcp_base_url, mcp_callback))
+                extra.append(("Claude", _CLAUDE_ORIGIN, _CLAUDE_CALLBACK))
+                for label, origin, callback in extra:
+                    callbacks.append(callback)
+                    web_origins.append(origin)
+                    print(f"   Adding {label} callback: {callback}")
+
+                allowed_origins = list(web_origins)
 
                 payload = {
                     "name": name,
@@ -804,42 +1094,11 @@ class Auth0MCPSetup:
                 print(f"❌ Failed to create user auth client: {e}")
                 raise
 
-        # Enable connection for this client (if tenant-level connection is provided)
-        if connection_id:
-            print(f"🔗 Enabling connection for user auth client...")
-            try:
-                # Get current client to check enabled_clients for the connection
-                connection = self._make_request("GET", f"/connections/{connection_id}")
-
-                # Check if connection is tenant-level
-                if connection.get("is_domain_connection", False):
-                    print(f"   ✅ Connection is tenant-level (available to all clients)")
-                else:
-                    # For app-level connections, need to explicitly enable
-                    enabled_clients = connection.get("enabled_clients", [])
-
-                    if client_id not in enabled_clients:
-                        enabled_clients.append(client_id)
-
-                        # Update connection to include this client
-                        self._make_request(
-                            "PATCH",
-                            f"/connections/{connection_id}",
-                            data={"enabled_clients": enabled_clients}
-                        )
-                        print(f"   ✅ Enabled connection for client")
-                    else:
-                        print(f"   ✅ Connection already enabled for client")
-
-            except Exception as e:
-                print(f"   ⚠️  Failed to enable connection: {e}")
-                print(f"   You may need to manually enable the connection in Auth0 dashboard")
-
         # Grant access to the MCP API (required for user auth to work)
         print(f"🔑 Granting test client access to API: {api_identifier}...")
         try:
             # Get API resource server
-            resource_servers = self._make_request("GET", "/resource-servers", silent_errors=True)
+            resource_servers = self._list_resource_servers(silent_errors=True)
             api = next((rs for rs in resource_servers if rs.get("identifier") == api_identifier), None)
 
             if not api:
@@ -848,20 +1107,24 @@ class Auth0MCPSetup:
                 # Get API scopes (including openid if defined)
                 scopes = [scope["value"] for scope in api.get("scopes", [])]
 
-                # Create client grant
+                # Create client grant unless the tenant already has it
                 try:
-                    grant_payload = {
-                        "client_id": client_id,
-                        "audience": api_identifier,
-                        "scope": scopes
-                    }
-
-                    self._make_request("POST", "/client-grants", data=grant_payload, silent_errors=True)
-                    print(f"✅ Granted API access to test client")
-                    print(f"   Scopes: {', '.join(scopes) if scopes else 'all'}")
+                    if reused and self._has_client_grant(client_id, api_identifier):
+                        print(f"✅ API access already granted")
+                    else:
+                        grant_payload = {
+                            "client_id": client_id,
+                            "audience": api_identifier,
+                            "scope": scopes
+                        }
+
+                        self._make_request(
+                            "POST", "/client-grants", data=grant_payload, silent_errors=True
+                        )
+                        print(f"✅ Granted API access to test client")
+                        print(f"   Scopes: {', '.join(scopes) if scopes else 'all'}")
                 except Exception as e:
-                    # Check if grant already exists
-                    if "already exists" in str(e).lower() or "conflict" in str(e).lower():
+                    if _is_conflict(e):
                         print(f"✅ API access already granted")
                     else:
                         print(f"⚠️  Failed to grant API access: {e}")
@@ -885,15 +1148,7 @@ class Auth0MCPSetup:
                 conn_id = conn.get("id", "")
                 is_domain = conn.get("is_domain_connection", False)
                 
-                strategy_label = {
-                    "auth0": "Database",
-                    "google-oauth2": "Google",
-                    "github": "GitHub",
-                    "facebook": "Facebook",
-                    "twitter": "Twitter",
-                    "windowslive": "Microsoft",
-                    "linkedin": "LinkedIn"
-                }.get(strategy, strategy.title())
+                strategy_label = _STRATEGY_LABELS.get(strategy) or strategy.title()
                 
                 domain_status = "✅ Tenant-level" if is_domain else "⚠️  App-level"
                 
@@ -911,8 +1166,9 @@ class Auth0MCPSetup:
         print(f"\n🚀 Promoting connection to tenant-level...")
         print(f"   Connection ID: {connection_id}")
         
+        endpoint = f"/connections/{connection_id}"
         try:
-            connection = self._make_request("GET", f"/connections/{connection_id}")
+            connection = self._get_cached(endpoint)
             
             if connection.get("is_domain_connection", False):
                 print("✅ Connection is already tenant-level")
@@ -924,9 +1180,12 @@ class Auth0MCPSetup:
             
             updated = self._make_request(
                 "PATCH",
-                f"/connections/{connection_id}",
+                endpoint,
                 data=payload
             )
+            # The PATCH response is the updated connection; keep it for
+            # enable_connection_for_clients instead of fetching it again
+            self._cache[self._cache_key(endpoint, None)] = updated
             
             print(f"✅ Successfully promoted connection to tenant-level!")
             print(f"   Connection: {updated.get('name', 'Unknown')}")
@@ -937,14 +1196,48 @@ class Auth0MCPSetup:
             print(f"❌ Failed to promote connection: {e}")
             return False
 
+    def enable_connection_for_clients(self, connection_id: str, client_ids: List[str]) -> bool:
+        """Enable an app-level connection for several clients with one PATCH."""
+        print(f"\n🔗 Enabling connection for user auth clients...")
+        endpoint = f"/connections/{connection_id}"
+        try:
+            connection = self._get_cached(endpoint)
+
+            # Check if connection is tenant-level
+            if connection.get("is_domain_connection", False):
+                print(f"   ✅ Connection is tenant-level (available to all clients)")
+                return True
+
+            # For app-level connections, need to explicitly enable
+            enabled_clients = connection.get("enabled_clients") or []
+            enabled_set = set(enabled_clients)
+            missing = [c for c in dict.fromkeys(client_ids) if c and c not in enabled_set]
+
+            if not missing:
+                print(f"   ✅ Connection already enabled for clients")
+                return True
+
+            self._make_request(
+                "PATCH",
+                endpoint,
+                data={"enabled_clients": enabled_clients + missing}
+            )
+            print(f"   ✅ Enabled connection for {len(missing)} client(s)")
+            return True
+
+        except Exception as e:
+            print(f"   ⚠️  Failed to enable connection: {e}")
+            print(f"   You may need to manually enable the connection in Auth0 dashboard")
+            return False
+
 
 def validate_domain(domain: str) -> str:
     """Validate and clean Auth0 domain."""
-    if domain.startswith("http://") or domain.startswith("https://"):
-        parsed = urlparse(domain)
-        domain = parsed.netloc
-    
-    domain = domain.rstrip("/")
+    if domain.startswith(("http://", "https://")):
+        # netloc never carries the path, so there is no trailing slash to strip
+        domain = urlparse(domain).netloc
+    else:
+        domain = domain.rstrip("/")
     
     if not domain or "." not in domain:
         raise ValueError(f"Invalid domain format: {domain}")
@@ -952,99 +1245,31 @@ def validate_domain(domain: str) -> str:
     return domain
 
 
+@functools.lru_cache(maxsize=8)
+def _parse_make_env(path: str, mtime: float) -> Dict[str, str]:
+    """Parse KEY=VALUE lines from make.env (cached per path and mtime)."""
+    lines = (line.strip() for line in Path(path).read_text().splitlines())
+    return dict(
+        line.split('=', 1) for line in lines
+        if line and line[0] != '#' and '=' in line
+    )
+
+
 def load_make_env(output_dir: str = ".") -> Dict[str, str]:
     """Load make.env configuration."""
     make_env_path = Path(output_dir) / "make.env"
-    env_vars = {}
-
-    if make_env_path.exists():
-        with open(make_env_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    env_vars[key] = value
-
-    return env_vars
-
-
-def save_output_files(
-    domain: str,
-    api_identifier: str,
-    mgmt_client_id: str,
-    mgmt_client_secret: str,
-    server_client_id: str,
-    server_client_secret: str,
-    test_client_id: str,
-    connection_id: str,
-    output_dir: str = ".",
-    save_config: bool = True,
-    use_dcr: bool = False
-) -> None:
-    """Save configuration files."""
-    print("\n💾 Saving configuration files...")
-
-    if save_config:
-        if not mgmt_client_secret:
-            print("⚠️  Warning: Management client secret not available")
-            print("   Configuration will be incomplete")
-            print("   Run with --recreate-client to generate a new secret")
-
-        if not server_client_secret:
-            print("⚠️  Warning: Server client secret not available")
-            print("   Configuration will be incomplete")
-            print("   Run with --recreate-client to generate a new secret")
-
-        # auth0-config.json - single source of truth
-        config = {
-            "domain": domain,
-            "issuer": f"https://{domain}",
-            "audience": api_identifier,
-            "management_api": {
-                "client_id": mgmt_client_id,
-                "client_secret": mgmt_client_secret
-            },
-            "server_client": {
-                "client_id": server_client_id,
-                "client_secret": server_client_secret
-            },
-            "test_client": {
-                "client_id": test_client_id
-            },
-            "connection_id": connection_id,
-            "dcr_enabled": use_dcr,
-            "connection_promoted": True
-        }
-
-        json_file = os.path.join(output_dir, "auth0-config.json")
-        with open(json_file, "w") as f:
-            json.dump(config, f, indent=2)
-        print(f"✅ Created {json_file}")
-    else:
-        print(f"⏭️  Skipping auth0-config.json (preserving existing secrets)")
-    
-    # Load make.env to get image repository and tag
-    make_env = load_make_env(output_dir)
-    registry = make_env.get('REGISTRY', 'your-registry.example.com')
-    image_name = make_env.get('IMAGE_NAME', 'mcp-server')
-    image_tag = make_env.get('TAG', '')
-    image_repo = f"{registry}/{image_name}"
-
-    # Extract hostname from audience URL for ingress
-    audience_parsed = urlparse(api_identifier)
-    ingress_host = audience_parsed.netloc or "mcp-api.example.com"
+    try:
+        mtime = make_env_path.stat().st_mtime
+    except OSError:
+        return {}
 
-    # Determine pull policy based on tag type
-    # Release tags (v1.0.0, v2.1.0-beta.1) use IfNotPresent
-    # Development tags (branch-commit, latest) use Always
-    import re
-    is_release_tag = bool(re.match(r'^v\d+\.\d+\.\d+', image_tag)) if image_tag else False
-    pull_policy = "IfNotPresent" if is_release_tag else "Always"
+    # Copy so callers can't modify the cached result
+    return dict(_parse_make_env(str(make_env_path), mtime))
 
-    pull_policy_comment = "# Release tag - cache images" if is_release_tag else "# Dev tag - always pull latest"
 
-    # Helm values file for deployment
-    helm_values = f"""# Helm Values for MCP Server with Auth0 (FastMCP OAuth Proxy)
+# Helm values written by save_output_files(); placeholders are filled with
+# str.format_map, so literal braces would need doubling
+_HELM_VALUES_TEMPLATE = """# Helm Values for MCP Server with Auth0 (FastMCP OAuth Proxy)
 # Generated by setup-auth0.py
 # Deploy with: helm install mcp-server ./chart -f auth0-values.yaml
 
@@ -1131,27 +1356,131 @@ testSidecar:
   tag: "{image_tag}"  # From make.env (leave empty to use Chart.AppVersion)
 """
 
+
+def save_output_files(
+    domain: str,
+    api_identifier: str,
+    mgmt_client_id: str,
+    mgmt_client_secret: str,
+    server_client_id: str,
+    server_client_secret: str,
+    test_client_id: str,
+    connection_id: str,
+    output_dir: str = ".",
+    save_config: bool = True,
+    use_dcr: bool = False
+) -> None:
+    """Save configuration files."""
+    print("\n💾 Saving configuration files...")
+
+    if save_config:
+        if not mgmt_client_secret:
+            print("⚠️  Warning: Management client secret not available")
+            print("   Configuration will be incomplete")
+            print("   Run with --recreate-client to generate a new secret")
+
+        if not server_client_secret:
+            print("⚠️  Warning: Server client secret not available")
+            print("   Configuration will be incomplete")
+            print("   Run with --recreate-client to generate a new secret")
+
+        # auth0-config.json - single source of truth
+        config = {
+            "domain": domain,
+            "issuer": f"https://{domain}",
+            "audience": api_identifier,
+            "management_api": {
+                "client_id": mgmt_client_id,
+                "client_secret": mgmt_client_secret
+            },
+            "server_client": {
+                "client_id": server_client_id,
+                "client_secret": server_client_secret
+            },
+            "test_client": {
+                "client_id": test_client_id
+            },
+            "connection_id": connection_id,
+            "dcr_enabled": use_dcr,
+            "connection_promoted": True
+        }
+
+        json_file = os.path.join(output_dir, "auth0-config.json")
+        write_atomic(json_file, dumps(config, pretty=True))
+        print(f"✅ Created {json_file}")
+    else:
+        print(f"⏭️  Skipping auth0-config.json (preserving existing secrets)")
+    
+    # Load make.env to get image repository and tag
+    make_env = load_make_env(output_dir)
+    registry = make_env.get('REGISTRY', 'your-registry.example.com')
+    image_name = make_env.get('IMAGE_NAME', 'mcp-server')
+    image_tag = make_env.get('TAG', '')
+    image_repo = f"{registry}/{image_name}"
+
+    # Extract hostname from audience URL for ingress
+    ingress_host = _parse_audience(api_identifier).netloc or "mcp-api.example.com"
+
+    # Determine pull policy based on tag type
+    # Release tags (v1.0.0, v2.1.0-beta.1) use IfNotPresent
+    # Development tags (branch-commit, latest) use Always
+    is_release_tag = bool(_RELEASE_TAG_RE.match(image_tag)) if image_tag else False
+    pull_policy = "IfNotPresent" if is_release_tag else "Always"
+
+    pull_policy_comment = "# Release tag - cache images" if is_release_tag else "# Dev tag - always pull latest"
+
+    # Helm values file for deployment
+    context = {
+        "image_repo": image_repo,
+        "image_tag": image_tag,
+        "pull_policy": pull_policy,
+        "pull_policy_comment": pull_policy_comment,
+        "domain": domain,
+        "api_identifier": api_identifier,
+        "server_client_id": server_client_id,
+        "ingress_host": ingress_host,
+    }
+
     helm_file = os.path.join(output_dir, "auth0-values.yaml")
-    with open(helm_file, "w") as f:
-        f.write(helm_values)
+    write_atomic(helm_file, _HELM_VALUES_TEMPLATE.format_map(context).encode())
     print(f"✅ Created {helm_file}")
     print(f"   Ready to deploy: helm install mcp-server ./chart -f {helm_file}")
 
 
-def get_management_token(domain: str, client_id: str, client_secret: str) -> Optional[str]:
+def get_management_token(
+    domain: str,
+    client_id: str,
+    client_secret: str,
+    session: Optional["requests.Session"] = None,
+    use_cache: bool = True,
+    read_cache: bool = True
+) -> Optional[str]:
     """
     Get a management API token using client credentials.
 
+    A still-valid token from an earlier run is reused from the on-disk cache;
+    otherwise a new one is requested and cached until Auth0 says it expires.
+
     Args:
         domain: Auth0 domain
         client_id: Management client ID
         client_secret: Management client secret
+        session: Session to send the request on (a new one is created if omitted)
+        use_cache: Read and write the on-disk token cache
+        read_cache: With use_cache, still request a new token (and cache it)
 
     Returns:
         Access token or None if failed
     """
+    if use_cache and read_cache:
+        token = get_cached_token(domain, client_id)
+        if token:
+            print("   Using cached management API token")
+            return token
+
+    session = session or create_session()
     try:
-        response = requests.post(
+        response = session.post(
             f'https://{domain}/oauth/token',
             json={
                 'grant_type': 'client_credentials',
@@ -1162,7 +1491,10 @@ def get_management_token(domain: str, client_id: str, client_secret: str) -> Opt
             timeout=30
         )
         response.raise_for_status()
-        return response.json()['access_token']
+        token_data = response.json()
+        if use_cache and token_data.get('expires_in'):
+            save_cached_token(domain, client_id, token_data['access_token'], token_data['expires_in'])
+        return token_data['access_token']
     except Exception as e:
         print(f"⚠️  Could not get management token: {e}")
         return None
@@ -1206,6 +1538,8 @@ Examples:
                        help="Enable Dynamic Client Registration (DCR) setup (default: False)")
     parser.add_argument("--no-save-config", action="store_false", dest="save_config",
                        help="Skip saving configuration to auth0-config.json")
+    parser.add_argument("--no-token-cache", action="store_true",
+                       help="Don't read or write the cached management API token")
     parser.add_argument("--yes", "-y", action="store_true",
                        help="Skip confirmation prompt")
 
@@ -1216,6 +1550,13 @@ Examples:
     print("=" * 70)
     
     config_mgr = ConfigManager(args.config_file)
+    saved = ResolvedSecrets.from_config(config_mgr.config)
+    # Shared by the token request and Auth0MCPSetup so the connection is reused
+    session = create_session()
+    # Set when the token came from saved credentials (and so may be cached)
+    token_client_id = None
+    # Set when the token came from the cache, to mint a new one if it's rejected
+    token_refresher = None
     
     # Get deployment name first so we can use it for API name default
     deployment_name = config_mgr.get_value('deployment_name', args.deployment_name, 'DEPLOYMENT_NAME', 'CNPG MCP')
@@ -1245,20 +1586,24 @@ Examples:
     # Try to get management token automatically if not provided
     if not config['token']:
         # Check if we have saved management client credentials
-        saved_mgmt_client_id = (
-            config_mgr.config.get('mgmt_client_id') or
-            (config_mgr.config.get('management_api', {}).get('client_id') if isinstance(config_mgr.config.get('management_api'), dict) else None)
-        )
-        saved_mgmt_client_secret = (
-            config_mgr.config.get('client_secret') or
-            (config_mgr.config.get('management_api', {}).get('client_secret') if isinstance(config_mgr.config.get('management_api'), dict) else None)
-        )
-
-        if saved_mgmt_client_id and saved_mgmt_client_secret and config['domain']:
+        if saved.mgmt_client_id and saved.mgmt_client_secret and config['domain']:
             print(f"\n🔑 No token provided via command line - using saved credentials to obtain one...")
-            token = get_management_token(config['domain'], saved_mgmt_client_id, saved_mgmt_client_secret)
+            use_cache = not args.no_token_cache
+            mint_token = functools.partial(
+                get_management_token,
+                config['domain'], saved.mgmt_client_id, saved.mgmt_client_secret,
+                session=session, use_cache=use_cache, read_cache=False
+            )
+            token = get_cached_token(config['domain'], saved.mgmt_client_id) if use_cache else None
+            if token:
+                print("   Using cached management API token")
+                token_refresher = mint_token
+            else:
+                token = mint_token()
             if token:
                 config['token'] = token
+                if use_cache:
+                    token_client_id = saved.mgmt_client_id
                 print(f"✅ Successfully obtained management token from saved credentials")
             else:
                 print(f"⚠️  Could not get management token from saved credentials")
@@ -1276,21 +1621,16 @@ Examples:
     # Special mode: if we have all needed data in config file, allow regenerating values file only
     # Only requires domain and mgmt_client_id - api_identifier can be generated from domain
     # Support both old format (management_api.client_id) and new format (mgmt_client_id)
-    saved_mgmt_client_id = (
-        config_mgr.config.get('mgmt_client_id') or
-        (config_mgr.config.get('management_api', {}).get('client_id') if isinstance(config_mgr.config.get('management_api'), dict) else None)
-    )
-
     has_saved_config = all([
         config_mgr.config.get('domain'),
-        saved_mgmt_client_id
+        saved.mgmt_client_id
     ])
 
     # Debug: Show what we have in saved config for regeneration
     if not config['token']:
         print(f"\n🔍 Checking saved config for regeneration:")
         print(f"  domain: {config_mgr.config.get('domain')}")
-        print(f"  mgmt_client_id: {saved_mgmt_client_id}")
+        print(f"  mgmt_client_id: {saved.mgmt_client_id}")
         print(f"  has_saved_config: {has_saved_config}")
 
     if missing:
@@ -1299,23 +1639,18 @@ Examples:
             # We have enough to regenerate values file
             config['domain'] = config_mgr.config['domain']
             # Use saved api_identifier or generate default from domain
-            config['api_identifier'] = config_mgr.config.get('api_identifier') or config_mgr.config.get('audience') or f"https://{config['domain']}/mcp"
-            mgmt_client_id = saved_mgmt_client_id
-
-            # Get secrets from saved config if available
-            server_client_secret = config_mgr.config.get('server_client', {}).get('client_secret', '')
-            mgmt_client_secret = config_mgr.config.get('management_api', {}).get('client_secret', '') or config_mgr.config.get('client_secret', '')
+            config['api_identifier'] = saved.api_identifier or f"https://{config['domain']}/mcp"
 
             # Generate values file only (don't overwrite config with empty secrets)
             save_output_files(
                 domain=config['domain'],
                 api_identifier=config['api_identifier'],
-                mgmt_client_id=mgmt_client_id,
-                mgmt_client_secret=mgmt_client_secret,  # From saved config
-                server_client_id=config_mgr.config.get('server_client', {}).get('client_id', ''),
-                server_client_secret=server_client_secret,  # From saved config
-                test_client_id=config_mgr.config.get('test_client', {}).get('client_id', ''),
-                connection_id=config_mgr.config.get('connection_id', ''),
+                mgmt_client_id=saved.mgmt_client_id,
+                mgmt_client_secret=saved.mgmt_client_secret,  # From saved config
+                server_client_id=saved.server_client_id,
+                server_client_secret=saved.server_client_secret,  # From saved config
+                test_client_id=saved.test_client_id,
+                connection_id=saved.connection_id,
                 output_dir=args.output_dir,
                 save_config=False,  # Don't overwrite config file - preserve existing secrets
                 use_dcr=config_mgr.config.get('dcr_enabled', False)  # From saved config
@@ -1345,13 +1680,17 @@ Examples:
         print("Auto-proceeding (--yes flag provided)")
         print()
     
+    setup = None
     try:
-        setup = Auth0MCPSetup(config['domain'], config['token'])
+        # A bad or expired token is reported by the first API call that
+        # gets a 401, so there is no separate validation request
+        setup = Auth0MCPSetup(
+            config['domain'], config['token'], session=session,
+            token_client_id=token_client_id, token_refresher=token_refresher
+        )
 
-        # Validate token before proceeding
-        print("\n🔐 Validating Auth0 management token...")
-        setup.validate_token()
-        print("✅ Token is valid")
+        # Look up the API and existing clients in parallel up front
+        setup.prefetch()
 
         # Try to enable DCR, but don't fail if we lack permissions (may already be enabled)
         # Only attempt DCR setup if --use-dcr flag is provided
@@ -1372,31 +1711,27 @@ Examples:
             print(f"   Continuing with client setup...")
             api = None
         
-        # Get existing management secret from correct location (try both old and new structure)
-        # Get existing secrets from saved config file, not command-line config
-        existing_mgmt_secret = config_mgr.config.get('management_api', {}).get('client_secret') or config_mgr.config.get('client_secret')
-
+        # Existing secrets come from the saved config file, not command-line config
         client, client_id, client_secret = setup.create_management_api_client(
             name=f"{config['deployment_name']} - Management API",
-            existing_secret=existing_mgmt_secret,
+            existing_secret=saved.mgmt_client_secret,
             recreate=args.recreate_client
         )
 
         # Create server client for FastMCP OAuth (optional - skip if we lack permissions)
-        server_client_config = config_mgr.config.get('server_client', {})
         try:
             server_client, server_client_id, server_client_secret = setup.create_server_client(
                 name=f"{config['deployment_name']} - Server",
                 api_identifier=config['api_identifier'],
-                existing_secret=server_client_config.get('client_secret'),
+                existing_secret=saved.server_client_secret,
                 recreate=args.recreate_client
             )
         except Exception as e:
             print(f"⚠️  Could not verify/create server client (may already exist): {e}")
             print(f"   Continuing with server client from config...")
             # Use existing server client from config if available
-            server_client_id = server_client_config.get('client_id', '')
-            server_client_secret = server_client_config.get('client_secret', '')
+            server_client_id = saved.server_client_id
+            server_client_secret = saved.server_client_secret
             server_client = None
 
         connection_id = config.get('connection_id')
@@ -1434,10 +1769,14 @@ Examples:
         test_client, test_client_id = setup.create_test_client(
             name=f"{config['deployment_name']} - Test Harness",
             api_identifier=config['api_identifier'],
-            connection_id=connection_id,
             recreate=args.recreate_client
         )
 
+        # Enable the connection for the user-login clients in one request
+        # (the management client is M2M and never uses a connection)
+        if connection_id:
+            setup.enable_connection_for_clients(connection_id, [server_client_id, test_client_id])
+
         save_output_files(
             domain=config['domain'],
             api_identifier=config['api_identifier'],
@@ -1453,11 +1792,8 @@ Examples:
         )
         
         if args.save_config:
-            # Preserve existing secrets if new ones aren't available
-            # Read from config_mgr.config (file config), not config (command-line config)
-            existing_mgmt_secret = config_mgr.config.get('management_api', {}).get('client_secret', '') or config_mgr.config.get('client_secret', '')
-            existing_server_secret = config_mgr.config.get('server_client', {}).get('client_secret', '')
-
+            # Preserve existing secrets (from the file config, not command-line
+            # config) if new ones aren't available
             config_to_save = {
                 'domain': config['domain'],
                 'issuer': f"https://{config['domain']}",
@@ -1473,13 +1809,13 @@ Examples:
             # Save management client credentials (preserve existing secret if not available)
             config_to_save['management_api'] = {
                 'client_id': client_id,
-                'client_secret': client_secret if client_secret else existing_mgmt_secret
+                'client_secret': client_secret if client_secret else saved.mgmt_client_secret
             }
 
             # Save server client credentials (preserve existing secret if not available)
             config_to_save['server_client'] = {
                 'client_id': server_client_id,
-                'client_secret': server_client_secret if server_client_secret else existing_server_secret
+                'client_secret': server_client_secret if server_client_secret else saved.server_client_secret
             }
 
             # Save test client (no secret for SPA client)
@@ -1490,55 +1826,63 @@ Examples:
 
             config_mgr.save_config(config_to_save)
         
-        print("\n" + "=" * 70)
-        print("✅ Auth0 Setup Complete!")
-        print("=" * 70)
-        print("\n🎉 Everything is configured:")
-        print("   ✅ DCR enabled")
-        print("   ✅ API created")
-        print("   ✅ Management client created")
-        print("   ✅ Connection promoted to tenant-level")
-        print("   ✅ Configuration saved to auth0-config.json")
-        print("   ✅ Helm values file created: auth0-values.yaml")
-
-        if not client_secret:
-            print("\n⚠️  Note: Management client secret not available")
-            print("   This is only needed for tenant management, not for MCP server operation")
-            print("   Run with --recreate-client to generate a new secret if needed")
-
-        print()
-        print("📋 Next Steps:")
-        print()
         # Get image info from make.env if available
         make_env = load_make_env(args.output_dir)
         registry = make_env.get('REGISTRY', 'your-registry')
         image_name = make_env.get('IMAGE_NAME', 'mcp-server')
         tag = make_env.get('TAG', 'latest')
 
-        print("1. Create Kubernetes Secret with Auth0 credentials:")
-        print("   python3 bin/create_secrets.py --namespace <your-namespace> --release-name <release-name> --replace")
-        print("   (creates <release-name>-auth0-credentials secret)")
-        print()
-        print("2. Build and push your MCP server container image:")
-        print(f"   make build push")
-        print(f"   (builds {registry}/{image_name}:{tag})")
-        print()
-        print("3. Update the image repository in auth0-values.yaml if needed")
-        print()
-        print("4. Deploy your MCP server with Helm:")
-        print("   helm install mcp-server ./chart -f auth0-values.yaml")
-        print()
-        print("5. Verify deployment:")
-        print("   kubectl get pods -l app.kubernetes.io/name=<release-name>")
-        print("   kubectl logs -l app.kubernetes.io/name=<release-name> -f")
-        print()
-        print("6. Test OAuth flow:")
-        print("   # Check OAuth metadata endpoint")
-        print("   curl https://your-domain/.well-known/oauth-authorization-server")
-        print()
-        print("   # Check MCP server health")
-        print("   curl https://your-domain/healthz")
-        print()
+        # Collect the summary and print it in one write
+        out: List[str] = [
+            "\n" + "=" * 70,
+            "✅ Auth0 Setup Complete!",
+            "=" * 70,
+            "\n🎉 Everything is configured:",
+            "   ✅ DCR enabled",
+            "   ✅ API created",
+            "   ✅ Management client created",
+            "   ✅ Connection promoted to tenant-level",
+            "   ✅ Configuration saved to auth0-config.json",
+            "   ✅ Helm values file created: auth0-values.yaml",
+        ]
+
+        if not client_secret:
+            out += [
+                "\n⚠️  Note: Management client secret not available",
+                "   This is only needed for tenant management, not for MCP server operation",
+                "   Run with --recreate-client to generate a new secret if needed",
+            ]
+
+        out += [
+            "",
+            "📋 Next Steps:",
+            "",
+            "1. Create Kubernetes Secret with Auth0 credentials:",
+            "   python3 bin/create_secrets.py --namespace <your-namespace> --release-name <release-name> --replace",
+            "   (creates <release-name>-auth0-credentials secret)",
+            "",
+            "2. Build and push your MCP server container image:",
+            "   make build push",
+            f"   (builds {registry}/{image_name}:{tag})",
+            "",
+            "3. Update the image repository in auth0-values.yaml if needed",
+            "",
+            "4. Deploy your MCP server with Helm:",
+            "   helm install mcp-server ./chart -f auth0-values.yaml",
+            "",
+            "5. Verify deployment:",
+            "   kubectl get pods -l app.kubernetes.io/name=<release-name>",
+            "   kubectl logs -l app.kubernetes.io/name=<release-name> -f",
+            "",
+            "6. Test OAuth flow:",
+            "   # Check OAuth metadata endpoint",
+            "   curl https://your-domain/.well-known/oauth-authorization-server",
+            "",
+            "   # Check MCP server health",
+            "   curl https://your-domain/healthz",
+            "",
+        ]
+        print("\n".join(out))
         
     except KeyboardInterrupt:
         print("\n\n⚠️  Cancelled")
@@ -1548,6 +1892,9 @@ Examples:
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        if setup is not None:
+            setup.close()
 
 
 if __name__ == "__main__":
@@ -12,24 +12,36 @@ Usage:
     mcp-base setup-oidc --provider auth0 --token YOUR_TOKEN
 """
 
+import importlib
 import sys
+from typing import Dict, List, Tuple
 
 
-SUPPORTED_PROVIDERS = ["auth0"]
+# provider -> (implementing module, entry point), listed in help/error order
+_DISPATCH: Dict[str, Tuple[str, str]] = {
+    "auth0": ("mcp_base.setup_auth0", "main"),
+}
 
+_PROVIDERS_DISPLAY = tuple(_DISPATCH)
+SUPPORTED_PROVIDERS = frozenset(_DISPATCH)
 
-def main():
-    # Check for --provider/-p argument manually to avoid consuming --help
+
+def _extract_provider(argv: List[str]) -> Tuple[str, List[str]]:
+    """
+    Pull --provider/-p out of argv in one pass.
+
+    Done by hand rather than with argparse so --help is left for the
+    provider-specific module. Returns (provider, remaining args).
+    """
     provider = "auth0"  # default
     remaining = []
 
-    args = sys.argv[1:]
     i = 0
-    while i < len(args):
-        arg = args[i]
+    while i < len(argv):
+        arg = argv[i]
         if arg in ("--provider", "-p"):
-            if i + 1 < len(args):
-                provider = args[i + 1]
+            if i + 1 < len(argv):
+                provider = argv[i + 1]
                 i += 2
                 continue
         elif arg.startswith("--provider="):
@@ -39,17 +51,22 @@ def main():
         remaining.append(arg)
         i += 1
 
+    return provider, remaining
+
+
+def main():
+    provider, remaining = _extract_provider(sys.argv[1:])
+
     if provider not in SUPPORTED_PROVIDERS:
         print(f"Error: Unknown provider '{provider}'")
-        print(f"Supported providers: {', '.join(SUPPORTED_PROVIDERS)}")
+        print(f"Supported providers: {', '.join(_PROVIDERS_DISPLAY)}")
         sys.exit(1)
 
     # Restore args for provider-specific module
     sys.argv = ["mcp-base setup-oidc"] + remaining
 
-    if provider == "auth0":
-        from mcp_base.setup_auth0 import main as auth0_main
-        auth0_main()
+    module_path, func_name = _DISPATCH[provider]
+    getattr(importlib.import_module(module_path), func_name)()
 
 
 if __name__ == "__main__":
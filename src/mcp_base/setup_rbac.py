@@ -13,17 +13,24 @@ Usage:
 """
 
 import argparse
+import functools
 import sys
-from typing import Optional, Dict, Any, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Optional, Dict, Any, List, Tuple
 
 try:
     from kubernetes import client, config
     from kubernetes.client.rest import ApiException
+    from urllib3.util.retry import Retry
 except ImportError:
     print("Error: kubernetes Python package not installed")
     print("   Install with: pip install kubernetes")
     sys.exit(1)
 
+if TYPE_CHECKING:
+    from kubernetes.config.kube_config import KubeConfigLoader
+
 
 # ============================================================================
 # Default RBAC Rules
@@ -31,89 +38,126 @@ except ImportError:
 
 # Default RBAC rules for typical MCP server operations
 # Override with --rules-file to customize
+# (tuples: these are shared by every manifest and must not be mutated)
 DEFAULT_RBAC_RULES = [
     {
-        "api_groups": [""],
-        "resources": ["pods", "services", "configmaps", "secrets"],
-        "verbs": ["get", "list", "watch"]
+        "api_groups": ("",),
+        "resources": ("pods", "services", "configmaps", "secrets"),
+        "verbs": ("get", "list", "watch")
     },
     {
-        "api_groups": ["apps"],
-        "resources": ["deployments", "statefulsets", "replicasets"],
-        "verbs": ["get", "list", "watch"]
+        "api_groups": ("apps",),
+        "resources": ("deployments", "statefulsets", "replicasets"),
+        "verbs": ("get", "list", "watch")
     },
     {
-        "api_groups": ["batch"],
-        "resources": ["jobs", "cronjobs"],
-        "verbs": ["get", "list", "watch"]
+        "api_groups": ("batch",),
+        "resources": ("jobs", "cronjobs"),
+        "verbs": ("get", "list", "watch")
     }
 ]
 
 
+def _normalize_rule(rule: Dict) -> Dict[str, Any]:
+    """Map a snake_case rule onto the Kubernetes PolicyRule field names.
+
+    tuple() returns tuples (such as the defaults) as-is, without copying.
+    """
+    return {
+        "apiGroups": tuple(rule["api_groups"]),
+        "resources": tuple(rule["resources"]),
+        "verbs": tuple(rule["verbs"])
+    }
+
+
+# The default rules never change, so convert them once rather than per manifest
+_DEFAULT_RULES_NORMALIZED = tuple(_normalize_rule(rule) for rule in DEFAULT_RBAC_RULES)
+
+
 # ============================================================================
 # RBAC Resource Definitions
 # ============================================================================
 
+# Value of the "component" label on every resource this tool manages
+_RBAC_COMPONENT = "rbac"
+
+_RBAC_API_GROUP = "rbac.authorization.k8s.io"
+_RBAC_API_VERSION = f"{_RBAC_API_GROUP}/v1"
+
+# apiVersion/kind header of each manifest; merged into a new dict per manifest
+_SA_SKELETON = {"apiVersion": "v1", "kind": "ServiceAccount"}
+_CLUSTER_ROLE_SKELETON = {"apiVersion": _RBAC_API_VERSION, "kind": "ClusterRole"}
+_ROLE_SKELETON = {"apiVersion": _RBAC_API_VERSION, "kind": "Role"}
+_CRB_SKELETON = {"apiVersion": _RBAC_API_VERSION, "kind": "ClusterRoleBinding"}
+_RB_SKELETON = {"apiVersion": _RBAC_API_VERSION, "kind": "RoleBinding"}
+
+# Server-side apply field manager that owns the fields this tool sets
+_FIELD_MANAGER = "mcp-base"
+
+
+def _labels(app_label: str) -> Dict[str, str]:
+    """Labels for an RBAC manifest (a fresh dict, since the client may mutate it)."""
+    return {"app": app_label, "component": _RBAC_COMPONENT}
+
+
+def _manifest_rules(rules: List[Dict]) -> List[Dict[str, Any]]:
+    """Return the manifest "rules" list for a ClusterRole or Role."""
+    if rules is DEFAULT_RBAC_RULES:
+        return list(_DEFAULT_RULES_NORMALIZED)
+    return [_normalize_rule(rule) for rule in rules]
+
+
 def get_service_account(namespace: str, name: str, app_label: str) -> Dict[str, Any]:
     """Generate ServiceAccount manifest."""
     return {
-        "apiVersion": "v1",
-        "kind": "ServiceAccount",
+        **_SA_SKELETON,
         "metadata": {
             "name": name,
             "namespace": namespace,
-            "labels": {
-                "app": app_label,
-                "component": "rbac"
-            }
+            "labels": _labels(app_label)
         }
     }
 
 
-def get_cluster_role(name: str, app_label: str, rules: List[Dict]) -> Dict[str, Any]:
-    """Generate ClusterRole manifest for cluster-wide access."""
+def get_cluster_role(
+    name: str,
+    app_label: str,
+    rules: List[Dict],
+    policy_rules: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """Generate ClusterRole manifest for cluster-wide access.
+
+    policy_rules, if given, is rules already converted by _manifest_rules().
+    """
     return {
-        "apiVersion": "rbac.authorization.k8s.io/v1",
-        "kind": "ClusterRole",
+        **_CLUSTER_ROLE_SKELETON,
         "metadata": {
             "name": name,
-            "labels": {
-                "app": app_label,
-                "component": "rbac"
-            }
+            "labels": _labels(app_label)
         },
-        "rules": [
-            {
-                "apiGroups": rule["api_groups"],
-                "resources": rule["resources"],
-                "verbs": rule["verbs"]
-            }
-            for rule in rules
-        ]
+        "rules": _manifest_rules(rules) if policy_rules is None else policy_rules
     }
 
 
-def get_role(namespace: str, name: str, app_label: str, rules: List[Dict]) -> Dict[str, Any]:
-    """Generate Role manifest for namespace-scoped access."""
+def get_role(
+    namespace: str,
+    name: str,
+    app_label: str,
+    rules: List[Dict],
+    policy_rules: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """Generate Role manifest for namespace-scoped access.
+
+    policy_rules, if given, is rules already converted by _manifest_rules().
+    """
     return {
-        "apiVersion": "rbac.authorization.k8s.io/v1",
-        "kind": "Role",
+        **_ROLE_SKELETON,
         "metadata": {
             "name": name,
             "namespace": namespace,
-            "labels": {
-                "app": app_label,
-                "component": "rbac"
-            }
+            "labels": _labels(app_label)
         },
-        "rules": [
-            {
-                "apiGroups": rule["api_groups"],
-                "resources": rule["resources"],
-                "verbs": rule["verbs"]
-            }
-            for rule in rules
-        ]
+        "rules": _manifest_rules(rules) if policy_rules is None else policy_rules
     }
 
 
@@ -126,14 +170,10 @@ def get_cluster_role_binding(
 ) -> Dict[str, Any]:
     """Generate ClusterRoleBinding manifest."""
     return {
-        "apiVersion": "rbac.authorization.k8s.io/v1",
-        "kind": "ClusterRoleBinding",
+        **_CRB_SKELETON,
         "metadata": {
             "name": name,
-            "labels": {
-                "app": app_label,
-                "component": "rbac"
-            }
+            "labels": _labels(app_label)
         },
         "subjects": [
             {
@@ -145,7 +185,7 @@ def get_cluster_role_binding(
         "roleRef": {
             "kind": "ClusterRole",
             "name": cluster_role_name,
-            "apiGroup": "rbac.authorization.k8s.io"
+            "apiGroup": _RBAC_API_GROUP
         }
     }
 
@@ -159,15 +199,11 @@ def get_role_binding(
 ) -> Dict[str, Any]:
     """Generate RoleBinding manifest."""
     return {
-        "apiVersion": "rbac.authorization.k8s.io/v1",
-        "kind": "RoleBinding",
+        **_RB_SKELETON,
         "metadata": {
             "name": name,
             "namespace": namespace,
-            "labels": {
-                "app": app_label,
-                "component": "rbac"
-            }
+            "labels": _labels(app_label)
         },
         "subjects": [
             {
@@ -179,7 +215,7 @@ def get_role_binding(
         "roleRef": {
             "kind": "Role",
             "name": role_name,
-            "apiGroup": "rbac.authorization.k8s.io"
+            "apiGroup": _RBAC_API_GROUP
         }
     }
 
@@ -188,6 +224,53 @@ def get_role_binding(
 # Resource Management Functions
 # ============================================================================
 
+@functools.lru_cache(maxsize=1)
+def _kubeconfig_loader() -> "KubeConfigLoader":
+    """
+    Parse the kubeconfig file(s) once per process.
+
+    Shared by get_current_namespace() (while parsing arguments) and the client
+    setup in _load_kube_config(), which would otherwise each re-read the YAML.
+    """
+    from kubernetes.config.kube_config import (
+        KUBE_CONFIG_DEFAULT_LOCATION,
+        KubeConfigLoader,
+        KubeConfigMerger,
+    )
+
+    merger = KubeConfigMerger(KUBE_CONFIG_DEFAULT_LOCATION)
+    if merger.config is None:
+        raise config.ConfigException("Invalid kube-config file. No configuration found.")
+    # Persist refreshed credentials (e.g. exec/OIDC tokens) like load_kube_config() does
+    return KubeConfigLoader(config_dict=merger.config, config_persister=merger.save_changes)
+
+
+@functools.cache
+def _load_kube_config() -> str:
+    """
+    Load in-cluster config, falling back to kubeconfig, once per process.
+
+    Returns a description of the source for the caller to print. Failures are
+    not cached, so a later call tries again.
+    """
+    try:
+        config.load_incluster_config()
+        return "Loaded in-cluster Kubernetes config"
+    except config.ConfigException:
+        configuration = client.Configuration()
+        _kubeconfig_loader().load_and_set(configuration)
+        client.Configuration.set_default(configuration)
+        return "Loaded kubeconfig from file"
+
+
+def _preload_kube_config() -> None:
+    """Warm _load_kube_config() in the background; RBACManager reports errors."""
+    try:
+        _load_kube_config()
+    except Exception:
+        pass
+
+
 class RBACManager:
     """Manages RBAC resources for MCP server."""
 
@@ -196,102 +279,122 @@ class RBACManager:
         self.app_name = app_name
         self.app_label = f"{app_name}-server"
         self.rules = rules
+        # Converted once; every Role/ClusterRole this manager applies reuses it
+        self._policy_rules = tuple(_manifest_rules(rules))
         self.dry_run = dry_run
 
         try:
-            config.load_incluster_config()
-            print("Loaded in-cluster Kubernetes config")
-        except config.ConfigException:
-            try:
-                config.load_kube_config()
-                print("Loaded kubeconfig from file")
-            except Exception as e:
-                print(f"Failed to load Kubernetes config: {e}", file=sys.stderr)
-                raise
-
-        self.core_v1 = client.CoreV1Api()
-        self.rbac_v1 = client.RbacAuthorizationV1Api()
-
-    def create_service_account(self, namespace: str, name: str) -> bool:
-        """Create a ServiceAccount."""
-        try:
-            sa = get_service_account(namespace, name, self.app_label)
-
-            if self.dry_run:
-                print(f"\n[DRY RUN] Would create ServiceAccount: {namespace}/{name}")
-                return True
+            print(_load_kube_config())
+        except Exception as e:
+            print(f"Failed to load Kubernetes config: {e}", file=sys.stderr)
+            raise
+
+        # One ApiClient (and so one urllib3 pool) serves both API groups, so the
+        # read/create calls of a run reuse a warm keep-alive connection
+        configuration = client.Configuration.get_default_copy()
+        configuration.connection_pool_maxsize = 10
+        # Ride out a briefly overloaded API server instead of aborting setup.
+        # Every call made is an apply PATCH, a DELETE or a GET, all safe to repeat;
+        # Retry-After is honoured on 429/503
+        configuration.retries = Retry(
+            total=5,
+            backoff_factor=0.25,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(["GET", "PATCH", "DELETE"]),
+            raise_on_status=False
+        )
+        self._api_client = client.ApiClient(configuration=configuration)
+        self.core_v1 = client.CoreV1Api(api_client=self._api_client)
+        self.rbac_v1 = client.RbacAuthorizationV1Api(api_client=self._api_client)
+
+    def close(self) -> None:
+        """Release the shared API client and its pooled connections."""
+        self._api_client.close()
+
+    def _apply(self, patch: Callable[..., Any], *args: str, body: Dict[str, Any]) -> Any:
+        """
+        Create or update a resource with one server-side apply request.
 
-            try:
-                self.core_v1.read_namespaced_service_account(name, namespace)
-                print(f"ServiceAccount {namespace}/{name} already exists")
-                return True
-            except ApiException as e:
-                if e.status != 404:
-                    raise
+        Replaces a read followed by a create: the API server creates the object
+        if it is missing and otherwise brings the fields we manage up to date.
+        """
+        return patch(
+            *args,
+            body=body,
+            field_manager=_FIELD_MANAGER,
+            force=True,
+            _content_type="application/apply-patch+yaml"
+        )
+
+    def _apply_resource(
+        self,
+        kind: str,
+        display_name: str,
+        patch: Callable[..., Any],
+        args: Tuple[str, ...],
+        body: Dict[str, Any],
+        hint: str,
+        details: Tuple[str, ...] = ()
+    ) -> bool:
+        """
+        Apply one manifest, or describe it in dry-run mode.
 
-            self.core_v1.create_namespaced_service_account(namespace, sa)
-            print(f"Created ServiceAccount: {namespace}/{name}")
+        Shared by every create_* method. Returns False (after reporting the
+        failure, with hint on a 403) if the API server rejects the request.
+        """
+        if self.dry_run:
+            print("\n".join([f"\n[DRY RUN] Would apply {kind}: {display_name}", *details]))
             return True
 
-        except ApiException as e:
-            print(f"Failed to create ServiceAccount {namespace}/{name}: {e.reason}", file=sys.stderr)
-            if e.status == 403:
-                print("  Hint: You may need cluster-admin permissions to create ServiceAccounts", file=sys.stderr)
-            return False
-
-    def create_cluster_role(self, name: str) -> bool:
-        """Create a ClusterRole."""
         try:
-            role = get_cluster_role(name, self.app_label, self.rules)
-
-            if self.dry_run:
-                print(f"\n[DRY RUN] Would create ClusterRole: {name}")
-                return True
-
-            try:
-                self.rbac_v1.read_cluster_role(name)
-                print(f"ClusterRole {name} already exists")
-                return True
-            except ApiException as e:
-                if e.status != 404:
-                    raise
-
-            self.rbac_v1.create_cluster_role(role)
-            print(f"Created ClusterRole: {name}")
-            return True
-
+            self._apply(patch, *args, body=body)
         except ApiException as e:
-            print(f"Failed to create ClusterRole {name}: {e.reason}", file=sys.stderr)
+            # One write, so concurrent setup steps don't interleave their lines
+            message = f"Failed to create {kind} {display_name}: {e.reason}"
             if e.status == 403:
-                print("  Hint: You need cluster-admin permissions to create ClusterRoles", file=sys.stderr)
+                message += f"\n  Hint: {hint}"
+            print(message, file=sys.stderr)
             return False
 
-    def create_role(self, namespace: str, name: str) -> bool:
-        """Create a namespace-scoped Role."""
-        try:
-            role = get_role(namespace, name, self.app_label, self.rules)
+        print(f"Applied {kind}: {display_name}")
+        return True
 
-            if self.dry_run:
-                print(f"\n[DRY RUN] Would create Role: {namespace}/{name}")
-                return True
-
-            try:
-                self.rbac_v1.read_namespaced_role(name, namespace)
-                print(f"Role {namespace}/{name} already exists")
-                return True
-            except ApiException as e:
-                if e.status != 404:
-                    raise
+    def create_service_account(self, namespace: str, name: str) -> bool:
+        """Create or update a ServiceAccount."""
+        return self._apply_resource(
+            "ServiceAccount",
+            f"{namespace}/{name}",
+            self.core_v1.patch_namespaced_service_account,
+            (name, namespace),
+            get_service_account(namespace, name, self.app_label),
+            hint="You may need cluster-admin permissions to create ServiceAccounts"
+        )
 
-            self.rbac_v1.create_namespaced_role(namespace, role)
-            print(f"Created Role: {namespace}/{name}")
-            return True
+    def create_cluster_role(self, name: str) -> bool:
+        """Create or update a ClusterRole."""
+        return self._apply_resource(
+            "ClusterRole",
+            name,
+            self.rbac_v1.patch_cluster_role,
+            (name,),
+            get_cluster_role(
+                name, self.app_label, self.rules, policy_rules=list(self._policy_rules)
+            ),
+            hint="You need cluster-admin permissions to create ClusterRoles"
+        )
 
-        except ApiException as e:
-            print(f"Failed to create Role {namespace}/{name}: {e.reason}", file=sys.stderr)
-            if e.status == 403:
-                print("  Hint: You may need admin permissions in the namespace", file=sys.stderr)
-            return False
+    def create_role(self, namespace: str, name: str) -> bool:
+        """Create or update a namespace-scoped Role."""
+        return self._apply_resource(
+            "Role",
+            f"{namespace}/{name}",
+            self.rbac_v1.patch_namespaced_role,
+            (name, namespace),
+            get_role(
+                namespace, name, self.app_label, self.rules, policy_rules=list(self._policy_rules)
+            ),
+            hint="You may need admin permissions in the namespace"
+        )
 
     def create_cluster_role_binding(
         self,
@@ -300,39 +403,25 @@ class RBACManager:
         service_account_namespace: str,
         cluster_role_name: str
     ) -> bool:
-        """Create a ClusterRoleBinding."""
-        try:
-            binding = get_cluster_role_binding(
+        """Create or update a ClusterRoleBinding."""
+        return self._apply_resource(
+            "ClusterRoleBinding",
+            name,
+            self.rbac_v1.patch_cluster_role_binding,
+            (name,),
+            get_cluster_role_binding(
                 name,
                 service_account_name,
                 service_account_namespace,
                 cluster_role_name,
                 self.app_label
+            ),
+            hint="You need cluster-admin permissions to create ClusterRoleBindings",
+            details=(
+                f"  Subject: ServiceAccount {service_account_namespace}/{service_account_name}",
+                f"  Role: ClusterRole {cluster_role_name}",
             )
-
-            if self.dry_run:
-                print(f"\n[DRY RUN] Would create ClusterRoleBinding: {name}")
-                print(f"  Subject: ServiceAccount {service_account_namespace}/{service_account_name}")
-                print(f"  Role: ClusterRole {cluster_role_name}")
-                return True
-
-            try:
-                self.rbac_v1.read_cluster_role_binding(name)
-                print(f"ClusterRoleBinding {name} already exists")
-                return True
-            except ApiException as e:
-                if e.status != 404:
-                    raise
-
-            self.rbac_v1.create_cluster_role_binding(binding)
-            print(f"Created ClusterRoleBinding: {name}")
-            return True
-
-        except ApiException as e:
-            print(f"Failed to create ClusterRoleBinding {name}: {e.reason}", file=sys.stderr)
-            if e.status == 403:
-                print("  Hint: You need cluster-admin permissions to create ClusterRoleBindings", file=sys.stderr)
-            return False
+        )
 
     def create_role_binding(
         self,
@@ -341,33 +430,19 @@ class RBACManager:
         service_account_name: str,
         role_name: str
     ) -> bool:
-        """Create a namespace-scoped RoleBinding."""
-        try:
-            binding = get_role_binding(namespace, name, service_account_name, role_name, self.app_label)
-
-            if self.dry_run:
-                print(f"\n[DRY RUN] Would create RoleBinding: {namespace}/{name}")
-                print(f"  Subject: ServiceAccount {namespace}/{service_account_name}")
-                print(f"  Role: Role {namespace}/{role_name}")
-                return True
-
-            try:
-                self.rbac_v1.read_namespaced_role_binding(name, namespace)
-                print(f"RoleBinding {namespace}/{name} already exists")
-                return True
-            except ApiException as e:
-                if e.status != 404:
-                    raise
-
-            self.rbac_v1.create_namespaced_role_binding(namespace, binding)
-            print(f"Created RoleBinding: {namespace}/{name}")
-            return True
-
-        except ApiException as e:
-            print(f"Failed to create RoleBinding {namespace}/{name}: {e.reason}", file=sys.stderr)
-            if e.status == 403:
-                print("  Hint: You may need admin permissions in the namespace", file=sys.stderr)
-            return False
+        """Create or update a namespace-scoped RoleBinding."""
+        return self._apply_resource(
+            "RoleBinding",
+            f"{namespace}/{name}",
+            self.rbac_v1.patch_namespaced_role_binding,
+            (name, namespace),
+            get_role_binding(namespace, name, service_account_name, role_name, self.app_label),
+            hint="You may need admin permissions in the namespace",
+            details=(
+                f"  Subject: ServiceAccount {namespace}/{service_account_name}",
+                f"  Role: Role {namespace}/{role_name}",
+            )
+        )
 
     def delete_service_account(self, namespace: str, name: str) -> bool:
         """Delete a ServiceAccount."""
@@ -464,6 +539,29 @@ class RBACManager:
 # Main Setup and Teardown Functions
 # ============================================================================
 
+def _print_header(
+    title: str,
+    namespace: str,
+    service_account: str,
+    app_name: str,
+    scope: str,
+    dry_run: bool
+) -> None:
+    """Print the banner and configuration summary for setup or teardown."""
+    print("\n".join([
+        "\n" + "="*60,
+        f"MCP Server - RBAC {title}",
+        "="*60,
+        "\nConfiguration:",
+        f"  Namespace: {namespace}",
+        f"  Service Account: {service_account}",
+        f"  App Name: {app_name}",
+        f"  Scope: {scope}",
+        f"  Dry Run: {dry_run}",
+        "",
+    ]))
+
+
 def setup_rbac(
     namespace: str,
     service_account: str,
@@ -488,73 +586,69 @@ def setup_rbac(
     Returns:
         True if all resources were created successfully, False otherwise
     """
-    print("\n" + "="*60)
-    print("MCP Server - RBAC Setup")
-    print("="*60)
-    print(f"\nConfiguration:")
-    print(f"  Namespace: {namespace}")
-    print(f"  Service Account: {service_account}")
-    print(f"  App Name: {app_name}")
-    print(f"  Scope: {scope}")
-    print(f"  Dry Run: {dry_run}")
-    print()
+    _print_header("Setup", namespace, service_account, app_name, scope, dry_run)
 
     manager = RBACManager(app_name=app_name, rules=rules, dry_run=dry_run)
-    success = True
-
-    if not manager.create_service_account(namespace, service_account):
-        success = False
-
-    if scope == "cluster":
-        role_name = f"{service_account}-role"
-        binding_name = f"{service_account}-binding"
-
-        if not manager.create_cluster_role(role_name):
-            success = False
-
-        if not manager.create_cluster_role_binding(
-            binding_name,
-            service_account,
-            namespace,
-            role_name
-        ):
-            success = False
-
-    else:  # namespace scope
-        role_name = f"{service_account}-role"
-        binding_name = f"{service_account}-binding"
-
-        if not manager.create_role(namespace, role_name):
-            success = False
-
-        if not manager.create_role_binding(
-            namespace,
-            binding_name,
-            service_account,
-            role_name
-        ):
-            success = False
-
-    print("\n" + "="*60)
+    role_name = f"{service_account}-role"
+    binding_name = f"{service_account}-binding"
+    try:
+        # The ServiceAccount and role are independent, so create them
+        # concurrently; the binding that ties them together goes last
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(manager.create_service_account, namespace, service_account)]
+            if scope == "cluster":
+                futures.append(executor.submit(manager.create_cluster_role, role_name))
+            else:  # namespace scope
+                futures.append(executor.submit(manager.create_role, namespace, role_name))
+            results = [future.result() for future in futures]
+
+        if scope == "cluster":
+            results.append(manager.create_cluster_role_binding(
+                binding_name,
+                service_account,
+                namespace,
+                role_name
+            ))
+        else:
+            results.append(manager.create_role_binding(
+                namespace,
+                binding_name,
+                service_account,
+                role_name
+            ))
+        success = all(results)
+    finally:
+        manager.close()
+
+    out = ["\n" + "="*60]
     if dry_run:
-        print("Dry run completed - no resources were actually created")
+        out.append("Dry run completed - no resources were actually created")
     elif success:
-        print("RBAC setup completed successfully!")
-        print("\nNext steps:")
-        print(f"  1. Use the service account in your MCP server deployment:")
-        print(f"     serviceAccountName: {service_account}")
-        print(f"  2. Verify permissions:")
-        print(f"     kubectl auth can-i list {verify_resource} \\")
-        print(f"       --as=system:serviceaccount:{namespace}:{service_account}")
+        out += [
+            "RBAC setup completed successfully!",
+            "\nNext steps:",
+            "  1. Use the service account in your MCP server deployment:",
+            f"     serviceAccountName: {service_account}",
+            "  2. Verify permissions:",
+            f"     kubectl auth can-i list {verify_resource} \\",
+            f"       --as=system:serviceaccount:{namespace}:{service_account}",
+        ]
     else:
-        print("RBAC setup completed with errors")
-        print("\nSome resources may not have been created.")
-        print("Check the error messages above for details.")
-    print("="*60 + "\n")
+        out += [
+            "RBAC setup completed with errors",
+            "\nSome resources may not have been created.",
+            "Check the error messages above for details.",
+        ]
+    out.append("="*60 + "\n")
+    print("\n".join(out))
 
     return success
 
 
+# Answers accepted at the teardown confirmation prompt
+_CONFIRM_ANSWERS = frozenset({"yes", "y"})
+
+
 def teardown_rbac(
     namespace: str,
     service_account: str,
@@ -577,57 +671,46 @@ def teardown_rbac(
     Returns:
         True if all resources were deleted successfully, False otherwise
     """
-    print("\n" + "="*60)
-    print("MCP Server - RBAC Teardown")
-    print("="*60)
-    print(f"\nConfiguration:")
-    print(f"  Namespace: {namespace}")
-    print(f"  Service Account: {service_account}")
-    print(f"  App Name: {app_name}")
-    print(f"  Scope: {scope}")
-    print(f"  Dry Run: {dry_run}")
-    print()
+    _print_header("Teardown", namespace, service_account, app_name, scope, dry_run)
 
     if not dry_run:
+        # Parse the kube config while the user reads the prompt
+        preload = threading.Thread(target=_preload_kube_config, daemon=True)
+        preload.start()
         response = input("Are you sure you want to delete these RBAC resources? (yes/no): ")
-        if response.lower() not in ['yes', 'y']:
+        if response.strip().lower() not in _CONFIRM_ANSWERS:
             print("Teardown cancelled.")
             return False
+        preload.join()
 
     manager = RBACManager(app_name=app_name, rules=rules, dry_run=dry_run)
-    success = True
-
-    if scope == "cluster":
-        role_name = f"{service_account}-role"
-        binding_name = f"{service_account}-binding"
-
-        if not manager.delete_cluster_role_binding(binding_name):
-            success = False
-
-        if not manager.delete_cluster_role(role_name):
-            success = False
-
-    else:  # namespace scope
-        role_name = f"{service_account}-role"
-        binding_name = f"{service_account}-binding"
-
-        if not manager.delete_role_binding(namespace, binding_name):
-            success = False
-
-        if not manager.delete_role(namespace, role_name):
-            success = False
-
-    if not manager.delete_service_account(namespace, service_account):
-        success = False
+    role_name = f"{service_account}-role"
+    binding_name = f"{service_account}-binding"
+    try:
+        # Remove the binding first, then the role and ServiceAccount concurrently
+        if scope == "cluster":
+            results = [manager.delete_cluster_role_binding(binding_name)]
+        else:  # namespace scope
+            results = [manager.delete_role_binding(namespace, binding_name)]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            if scope == "cluster":
+                futures = [executor.submit(manager.delete_cluster_role, role_name)]
+            else:
+                futures = [executor.submit(manager.delete_role, namespace, role_name)]
+            futures.append(executor.submit(manager.delete_service_account, namespace, service_account))
+            results += [future.result() for future in futures]
+        success = all(results)
+    finally:
+        manager.close()
 
-    print("\n" + "="*60)
     if dry_run:
-        print("Dry run completed - no resources were actually deleted")
+        result = "Dry run completed - no resources were actually deleted"
     elif success:
-        print("RBAC teardown completed successfully!")
+        result = "RBAC teardown completed successfully!"
     else:
-        print("RBAC teardown completed with errors")
-    print("="*60 + "\n")
+        result = "RBAC teardown completed with errors"
+    print("\n".join(["\n" + "="*60, result, "="*60 + "\n"]))
 
     return success
 
@@ -639,7 +722,7 @@ def teardown_rbac(
 def get_current_namespace() -> str:
     """Get the current namespace from the Kubernetes context."""
     try:
-        contexts, active_context = config.list_kube_config_contexts()
+        active_context = _kubeconfig_loader().current_context
 
         if not active_context:
             return "default"
@@ -655,13 +738,18 @@ def get_current_namespace() -> str:
         return "default"
 
 
+# Fields every --rules-file rule needs (in error-message order)
+_RULE_FIELDS = ("api_groups", "resources", "verbs")
+_REQUIRED_RULE_FIELDS = frozenset(_RULE_FIELDS)
+
+
 def load_rules_from_file(rules_file: str) -> List[Dict]:
     """Load RBAC rules from a JSON file."""
-    import json
+    from mcp_base._json import JSONDecodeError, loads
 
     try:
-        with open(rules_file, 'r') as f:
-            rules = json.load(f)
+        with open(rules_file, 'rb') as f:
+            rules = loads(f.read())
 
         # Validate structure
         if not isinstance(rules, list):
@@ -669,9 +757,10 @@ def load_rules_from_file(rules_file: str) -> List[Dict]:
             sys.exit(1)
 
         for i, rule in enumerate(rules):
-            required = ["api_groups", "resources", "verbs"]
-            missing = [k for k in required if k not in rule]
-            if missing:
+            if not (isinstance(rule, dict) and _REQUIRED_RULE_FIELDS.issubset(rule)):
+                # Only the failing rule pays for working out which fields are absent
+                fields = rule if isinstance(rule, dict) else {}
+                missing = [k for k in _RULE_FIELDS if k not in fields]
                 print(f"Error: Rule {i} missing required fields: {missing}", file=sys.stderr)
                 sys.exit(1)
 
@@ -680,7 +769,7 @@ def load_rules_from_file(rules_file: str) -> List[Dict]:
     except FileNotFoundError:
         print(f"Error: Rules file not found: {rules_file}", file=sys.stderr)
         sys.exit(1)
-    except json.JSONDecodeError as e:
+    except JSONDecodeError as e:
         print(f"Error: Invalid JSON in rules file: {e}", file=sys.stderr)
         sys.exit(1)
 
@@ -689,11 +778,20 @@ def load_rules_from_file(rules_file: str) -> List[Dict]:
 # CLI Entry Point
 # ============================================================================
 
+# Stands in for the context namespace in help text until help is actually shown
+_CURRENT_NAMESPACE = "<current_namespace>"
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    """ArgumentParser that only reads the kube context when rendering help."""
+
+    def format_help(self) -> str:
+        return super().format_help().replace(_CURRENT_NAMESPACE, get_current_namespace())
+
+
 def parse_args():
     """Parse command-line arguments."""
-    current_namespace = get_current_namespace()
-
-    parser = argparse.ArgumentParser(
+    parser = _ArgumentParser(
         description="Setup or teardown RBAC resources for MCP server",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog=f"""
@@ -719,7 +817,7 @@ Examples:
   # Dry run deletion
   python setup-rbac.py --app-name my-server --delete --dry-run
 
-Current context namespace: {current_namespace}
+Current context namespace: {_CURRENT_NAMESPACE}
 
 Rules file format (JSON):
   [
@@ -744,8 +842,7 @@ Requirements:
 
     parser.add_argument(
         "--namespace", "-n",
-        default=current_namespace,
-        help=f"Kubernetes namespace for the service account (default: inferred from context, currently '{current_namespace}')"
+        help=f"Kubernetes namespace for the service account (default: inferred from context, currently '{_CURRENT_NAMESPACE}')"
     )
 
     parser.add_argument(
@@ -789,7 +886,11 @@ Requirements:
         help="Delete RBAC resources instead of creating them"
     )
 
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.namespace is None:
+        # Only look up the context namespace when --namespace was not given
+        args.namespace = get_current_namespace()
+    return args
 
 
 def main():
@@ -0,0 +1,62 @@
+"""Tests for add_user's Management API calls."""
+
+import json
+from unittest import mock
+
+from mcp_base._token_cache import get_cached_token
+from mcp_base.add_user import fetch_management_token, search_users
+
+DOMAIN = "tenant.auth0.com"
+
+
+def token_session(payload):
+    """A mock session whose POST /oauth/token answers with payload."""
+    session = mock.Mock()
+    session.post.return_value.status_code = 200
+    session.post.return_value.json.return_value = payload
+    session.post.return_value.content = json.dumps(payload).encode()
+    return session
+
+
+def users_response(users):
+    response = mock.Mock(status_code=200)
+    response.content = json.dumps(users).encode()
+    return response
+
+
+def test_fetch_management_token_caches():
+    session = token_session({"access_token": "minted", "expires_in": 86400})
+
+    assert fetch_management_token(session, DOMAIN, "mgmt", "secret") == "minted"
+    assert get_cached_token(DOMAIN, "mgmt") == "minted"
+
+
+def test_fetch_management_token_without_cache():
+    session = token_session({"access_token": "minted", "expires_in": 86400})
+
+    assert fetch_management_token(session, DOMAIN, "mgmt", "secret", use_cache=False) == "minted"
+    assert get_cached_token(DOMAIN, "mgmt") is None
+
+
+def test_search_users_prefers_exact_email_lookup():
+    session = mock.Mock()
+    session.get.return_value = users_response([{"user_id": "auth0|1"}])
+
+    result = search_users(session, DOMAIN, "user@example.com")
+
+    assert result is session.get.return_value
+    session.get.assert_called_once_with(
+        f"https://{DOMAIN}/api/v2/users-by-email",
+        params={"email": "user@example.com"},
+    )
+
+
+def test_search_users_finds_mixed_case_address():
+    # users-by-email misses "User@Example.com" when looked up in lower case
+    session = mock.Mock()
+    found = users_response([{"user_id": "auth0|1", "email": "User@Example.com"}])
+    session.get.side_effect = [users_response([]), found]
+
+    assert search_users(session, DOMAIN, "user@example.com") is found
+    assert session.get.call_args.args == (f"https://{DOMAIN}/api/v2/users",)
+    assert session.get.call_args.kwargs == {"params": {"q": 'email:"user@example.com"'}}
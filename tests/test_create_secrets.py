@@ -0,0 +1,121 @@
+"""Tests for KubernetesSecretCreator.create_secret against a mocked CoreV1 client."""
+
+import base64
+from unittest import mock
+
+import pytest
+from kubernetes.client.rest import ApiException
+
+from mcp_base.create_secrets import KubernetesSecretCreator
+
+
+@pytest.fixture
+def core_v1(monkeypatch):
+    """The CoreV1Api every creator in the test gets, with kubeconfig loading stubbed."""
+    api = mock.Mock()
+    monkeypatch.setattr(KubernetesSecretCreator, "_load_kube_config", mock.Mock())
+    monkeypatch.setattr("kubernetes.client.CoreV1Api", mock.Mock(return_value=api))
+    monkeypatch.setattr("kubernetes.client.VersionApi", mock.Mock())
+    return api
+
+
+def make_creator(dry_run=False):
+    return KubernetesSecretCreator(namespace="mcp", dry_run=dry_run)
+
+
+def test_create_encodes_data_and_labels(core_v1):
+    creator = make_creator()
+
+    assert creator.create_secret("creds", {"key": "välue", "long": "x" * 100}, labels={"tier": "auth"})
+
+    core_v1.replace_namespaced_secret.assert_not_called()
+    secret = core_v1.create_namespaced_secret.call_args.kwargs["body"]
+    assert base64.b64decode(secret.data["key"]).decode() == "välue"
+    # One unbroken base64 string, with no trailing newline
+    assert secret.data["long"] == base64.b64encode(b"x" * 100).decode()
+    assert secret.metadata.labels == {
+        "app": "mcp-server",
+        "managed-by": "mcp-server-setup-script",
+        "tier": "auth",
+    }
+
+
+def test_create_reports_existing_secret(core_v1, capsys):
+    core_v1.create_namespaced_secret.side_effect = ApiException(status=409)
+    creator = make_creator()
+
+    assert not creator.create_secret("creds", {"key": "value"})
+    assert "already exists" in capsys.readouterr().out
+    core_v1.read_namespaced_secret.assert_not_called()
+
+
+def test_replace_is_a_single_put(core_v1):
+    creator = make_creator()
+
+    assert creator.create_secret("creds", {"key": "value"}, replace=True)
+
+    assert core_v1.replace_namespaced_secret.call_args.kwargs["name"] == "creds"
+    assert core_v1.replace_namespaced_secret.call_args.kwargs["namespace"] == "mcp"
+    core_v1.create_namespaced_secret.assert_not_called()
+    core_v1.delete_namespaced_secret.assert_not_called()
+    core_v1.read_namespaced_secret.assert_not_called()
+
+
+def test_replace_creates_missing_secret(core_v1):
+    core_v1.replace_namespaced_secret.side_effect = ApiException(status=404)
+    creator = make_creator()
+
+    assert creator.create_secret("creds", {"key": "value"}, replace=True)
+    core_v1.create_namespaced_secret.assert_called_once()
+
+
+def test_replace_recreates_secret_with_immutable_changes(core_v1):
+    core_v1.replace_namespaced_secret.side_effect = ApiException(status=422)
+    creator = make_creator()
+
+    assert creator.create_secret("creds", {"key": "value"}, replace=True)
+    assert core_v1.delete_namespaced_secret.call_args.kwargs["name"] == "creds"
+    core_v1.create_namespaced_secret.assert_called_once()
+
+
+def test_replace_failure_is_reported(core_v1, capsys):
+    core_v1.replace_namespaced_secret.side_effect = ApiException(status=403, reason="Forbidden")
+    creator = make_creator()
+
+    assert not creator.create_secret("creds", {"key": "value"}, replace=True)
+    core_v1.create_namespaced_secret.assert_not_called()
+    assert "Failed to create secret: Forbidden" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    ("exists", "replace", "result", "message"),
+    [
+        (False, False, True, "Would create secret"),
+        (True, False, False, "already exists"),
+        (True, True, True, "Would replace secret"),
+        (False, True, True, "Would create secret"),
+    ],
+)
+def test_dry_run_checks_existence_read_only(exists, replace, result, message, core_v1, capsys):
+    if not exists:
+        core_v1.read_namespaced_secret.side_effect = ApiException(status=404)
+    creator = make_creator(dry_run=True)
+
+    assert creator.create_secret("creds", {"key": "value"}, replace=replace) is result
+
+    assert message in capsys.readouterr().out
+    core_v1.read_namespaced_secret.assert_called_once_with("creds", "mcp")
+    core_v1.create_namespaced_secret.assert_not_called()
+    core_v1.replace_namespaced_secret.assert_not_called()
+
+
+def test_dry_run_without_cluster_access(core_v1, monkeypatch, capsys):
+    monkeypatch.setattr(
+        KubernetesSecretCreator, "_load_kube_config", mock.Mock(side_effect=Exception("no config"))
+    )
+    creator = make_creator(dry_run=True)
+
+    assert creator.create_secret("creds", {"key": "value"}, replace=True)
+
+    assert "Would create or replace secret" in capsys.readouterr().out
+    core_v1.read_namespaced_secret.assert_not_called()
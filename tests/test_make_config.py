@@ -0,0 +1,46 @@
+"""Tests for make_config's name and URL helpers."""
+
+import pytest
+
+from mcp_base.make_config import to_snake_case, validate_url
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        ("my-server", "my_server"),
+        ("My Server", "my_server"),
+        ("MyServer", "my_server"),
+        ("myServer", "my_server"),
+        ("already_snake", "already_snake"),
+        ("__leading", "leading"),
+        ("a--b  c__d", "a_b_c_d"),
+        ("Mixed-Case Name", "mixed_case_name"),
+        ("", ""),
+    ],
+)
+def test_to_snake_case(name, expected):
+    assert to_snake_case(name) == expected
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://mcp.example.com/mcp",
+        "http://localhost:8000",
+        "https://[::1]:8443/mcp",
+        "ftp://files.example.com",
+        "https://bücher.example/mcp",
+    ],
+)
+def test_validate_url_accepts(url):
+    assert validate_url(url, "URL") is True
+
+
+@pytest.mark.parametrize(
+    "url",
+    ["", "mcp.example.com", "https://", "https:///path", "http://?q", "/relative/path"],
+)
+def test_validate_url_rejects(url, capsys):
+    assert validate_url(url, "Server URL") is False
+    assert "Server URL must be a valid URL" in capsys.readouterr().out
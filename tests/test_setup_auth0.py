@@ -0,0 +1,281 @@
+"""Tests for Auth0MCPSetup against a fake Management API."""
+
+import json
+import threading
+from unittest import mock
+from urllib.parse import urlparse
+
+import pytest
+import requests
+
+from mcp_base import setup_auth0
+from mcp_base._token_cache import get_cached_token, save_cached_token
+from mcp_base.setup_auth0 import Auth0MCPSetup, get_management_token
+
+DOMAIN = "tenant.auth0.com"
+
+
+def make_response(status_code, payload=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(payload if payload is not None else {}).encode()
+    response.url = f"https://{DOMAIN}/api/v2"
+    return response
+
+
+class FakeManagementAPI:
+    """Answers requests.Session requests from paged in-memory listings."""
+
+    def __init__(self, listings=None, errors=None):
+        self.listings = listings or {}
+        # path -> status codes (or (status, message) pairs) to fail with first
+        self.errors = errors or {}
+        # Authorization headers answered with 401 on every path
+        self.rejected = set()
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def request(self, session, method, url, json=None, params=None, timeout=None, **kwargs):
+        path = urlparse(url).path[len("/api/v2"):]
+        with self._lock:
+            self.calls.append(
+                (method, path, dict(params or {}), session.headers.get("Authorization"))
+            )
+            if session.headers.get("Authorization") in self.rejected:
+                return make_response(401, {"message": "Unauthorized"})
+            pending = self.errors.get(path)
+            if pending:
+                status, message = pending.pop(0), "Unauthorized"
+                if isinstance(status, tuple):
+                    status, message = status
+                return make_response(status, {"message": message})
+        key, items = self.listings[path]
+        page, per_page = params["page"], params["per_page"]
+        return make_response(
+            200,
+            {key: items[page * per_page:(page + 1) * per_page], "total": len(items)},
+        )
+
+    def gets(self, path):
+        return [call for call in self.calls if call[0] == "GET" and call[1] == path]
+
+
+@pytest.fixture
+def fake_api():
+    """Route every requests.Session request through a FakeManagementAPI."""
+    api = FakeManagementAPI()
+    with mock.patch.object(
+        requests.Session, "request", autospec=True, side_effect=api.request
+    ):
+        yield api
+
+
+def clients(count):
+    return [
+        {"client_id": f"id-{i}", "name": f"client-{i}", "app_type": "regular_web"}
+        for i in range(count)
+    ]
+
+
+def test_find_client_by_name_scans_every_page(fake_api):
+    tenant_clients = clients(150)
+    tenant_clients.append({"client_id": "mgmt", "name": "client-7", "app_type": "non_interactive"})
+    fake_api.listings["/clients"] = ("clients", tenant_clients)
+    setup = Auth0MCPSetup(DOMAIN, "token")
+
+    assert setup._find_client_by_name("client-149")["client_id"] == "id-149"
+    assert setup.get_management_client("client-7")["client_id"] == "mgmt"
+    assert setup._find_client_by_name("client-1")["client_id"] == "id-1"
+    # Exact names only, no prefix or substring matches
+    assert setup._find_client_by_name("client-15")["client_id"] == "id-15"
+    assert setup._find_client_by_name("client") is None
+
+    # Two pages, fetched once and shared by every lookup
+    pages = fake_api.gets("/clients")
+    assert [params["page"] for _, _, params, _ in pages] == [0, 1]
+    assert pages[0][2]["fields"] == setup_auth0._CLIENT_FIELDS
+
+
+def test_resource_servers_are_paged(fake_api):
+    apis = [{"id": f"api-{i}", "identifier": f"https://api-{i}"} for i in range(120)]
+    fake_api.listings["/resource-servers"] = ("resource_servers", apis)
+    setup = Auth0MCPSetup(DOMAIN, "token")
+
+    assert setup._list_resource_servers() == apis
+    pages = fake_api.gets("/resource-servers")
+    assert [params["page"] for _, _, params, _ in pages] == [0, 1]
+    assert pages[0][2]["fields"] == setup_auth0._RESOURCE_SERVER_FIELDS
+
+
+def test_get_management_client_raises_when_lookup_fails(fake_api):
+    fake_api.listings["/clients"] = ("clients", clients(3))
+    fake_api.errors["/clients"] = [500]
+    setup = Auth0MCPSetup(DOMAIN, "token")
+
+    with pytest.raises(requests.HTTPError):
+        setup.get_management_client("client-1")
+
+
+def test_write_invalidates_cached_listing(fake_api):
+    fake_api.listings["/clients"] = ("clients", clients(3))
+    setup = Auth0MCPSetup(DOMAIN, "token")
+
+    setup._list_clients()
+    setup._invalidate("/clients/id-1")
+    setup._list_clients()
+    assert len(fake_api.gets("/clients")) == 2
+
+
+def test_rejected_token_exits_from_the_first_call(fake_api, capsys):
+    fake_api.listings["/clients"] = ("clients", clients(1))
+    fake_api.errors["/clients"] = [401]
+    setup = Auth0MCPSetup(DOMAIN, "bad")
+
+    with pytest.raises(SystemExit):
+        setup._list_clients()
+    assert len(fake_api.calls) == 1
+    assert "AUTHENTICATION FAILED" in capsys.readouterr().out
+
+
+def test_expired_token_is_reported(fake_api, capsys):
+    fake_api.listings["/clients"] = ("clients", clients(1))
+    fake_api.errors["/clients"] = [(401, "Expired token received for JSON Web Token validation")]
+    setup = Auth0MCPSetup(DOMAIN, "old")
+
+    with pytest.raises(SystemExit):
+        setup.get_management_client("client-0")
+    assert "TOKEN EXPIRED" in capsys.readouterr().out
+
+
+class TokenSession:
+    """Answers POST /oauth/token with a new token each time."""
+
+    def __init__(self):
+        self.posts = 0
+
+    def post(self, url, json=None, timeout=None):
+        self.posts += 1
+        return make_response(200, {"access_token": f"minted-{self.posts}", "expires_in": 86400})
+
+
+def test_get_management_token_uses_cache():
+    save_cached_token(DOMAIN, "mgmt", "cached", 86400)
+    session = TokenSession()
+
+    assert get_management_token(DOMAIN, "mgmt", "secret", session=session) == "cached"
+    assert session.posts == 0
+
+
+def test_get_management_token_mints_and_caches():
+    session = TokenSession()
+
+    assert get_management_token(DOMAIN, "mgmt", "secret", session=session) == "minted-1"
+    assert get_cached_token(DOMAIN, "mgmt") == "minted-1"
+
+
+def test_get_management_token_without_cache():
+    save_cached_token(DOMAIN, "mgmt", "cached", 86400)
+    session = TokenSession()
+
+    token = get_management_token(DOMAIN, "mgmt", "secret", session=session, use_cache=False)
+    assert token == "minted-1"
+    assert get_cached_token(DOMAIN, "mgmt") == "cached"
+
+
+def prefetch_listings(fake_api):
+    fake_api.listings.update({
+        "/clients": ("clients", clients(3)),
+        "/resource-servers": ("resource_servers", [{"id": "api", "identifier": "https://mcp"}]),
+        "/client-grants": ("client_grants", [{"client_id": "id-1", "audience": "https://mcp"}]),
+    })
+
+
+def test_prefetch_serves_later_lookups_from_cache(fake_api):
+    prefetch_listings(fake_api)
+    setup = Auth0MCPSetup(DOMAIN, "token")
+
+    setup.prefetch()
+    fetched = len(fake_api.calls)
+
+    assert setup._find_client_by_name("client-2")["client_id"] == "id-2"
+    assert setup._list_resource_servers()[0]["id"] == "api"
+    assert setup._has_client_grant("id-1", "https://mcp")
+    assert not setup._has_client_grant("id-2", "https://mcp")
+    assert len(fake_api.calls) == fetched == 3
+
+
+def test_prefetch_leaves_errors_to_later_lookups(fake_api):
+    prefetch_listings(fake_api)
+    fake_api.errors["/clients"] = [500]
+    setup = Auth0MCPSetup(DOMAIN, "token")
+
+    setup.prefetch()
+    assert setup._find_client_by_name("client-0")["client_id"] == "id-0"
+    assert len(fake_api.gets("/clients")) == 2
+
+
+def test_prefetch_exits_on_rejected_token(fake_api, capsys):
+    prefetch_listings(fake_api)
+    fake_api.errors["/clients"] = [401]
+    setup = Auth0MCPSetup(DOMAIN, "bad")
+
+    with pytest.raises(SystemExit):
+        setup.prefetch()
+    assert "AUTHENTICATION FAILED" in capsys.readouterr().out
+
+
+def test_get_management_token_can_skip_cache_read():
+    save_cached_token(DOMAIN, "mgmt", "cached", 86400)
+    session = TokenSession()
+
+    token = get_management_token(DOMAIN, "mgmt", "secret", session=session, read_cache=False)
+    assert token == "minted-1"
+    assert get_cached_token(DOMAIN, "mgmt") == "minted-1"
+
+
+def test_rejected_cached_token_is_reminted_once(fake_api):
+    save_cached_token(DOMAIN, "mgmt", "stale", 86400)
+    fake_api.listings["/clients"] = ("clients", clients(1))
+    fake_api.errors["/clients"] = [401]
+    minted = []
+
+    def refresher():
+        minted.append(True)
+        return "fresh"
+
+    setup = Auth0MCPSetup(DOMAIN, "stale", token_client_id="mgmt", token_refresher=refresher)
+
+    assert setup._list_clients()[0]["client_id"] == "id-0"
+    assert minted == [True]
+    assert [call[3] for call in fake_api.calls] == ["Bearer stale", "Bearer fresh"]
+    assert setup.access_token == "fresh"
+    assert get_cached_token(DOMAIN, "mgmt") is None
+
+
+def test_second_rejection_exits(fake_api, capsys):
+    fake_api.listings["/clients"] = ("clients", clients(1))
+    fake_api.errors["/clients"] = [401, 401]
+    setup = Auth0MCPSetup(
+        DOMAIN, "stale", token_client_id="mgmt", token_refresher=lambda: "fresh"
+    )
+
+    with pytest.raises(SystemExit):
+        setup._list_clients()
+    assert len(fake_api.calls) == 2
+    assert "AUTHENTICATION FAILED" in capsys.readouterr().out
+
+
+def test_prefetch_workers_share_one_reminted_token(fake_api):
+    prefetch_listings(fake_api)
+    fake_api.rejected.add("Bearer stale")
+    minted = []
+
+    def refresher():
+        minted.append(True)
+        return "fresh"
+
+    setup = Auth0MCPSetup(DOMAIN, "stale", token_client_id="mgmt", token_refresher=refresher)
+
+    setup.prefetch()
+    assert minted == [True]
+    assert setup._find_client_by_name("client-1")["client_id"] == "id-1"
@@ -0,0 +1,214 @@
+"""Tests for the RBAC manifests and their server-side apply requests."""
+
+from unittest import mock
+
+import pytest
+from kubernetes.client.rest import ApiException
+
+from mcp_base import setup_rbac
+from mcp_base.setup_rbac import (
+    DEFAULT_RBAC_RULES,
+    RBACManager,
+    get_cluster_role,
+    get_cluster_role_binding,
+    get_current_namespace,
+    get_role,
+    get_role_binding,
+    get_service_account,
+)
+
+
+def test_role_manifests_use_policy_rule_field_names():
+    rules = [{"api_groups": [""], "resources": ["pods"], "verbs": ["get"]}]
+    expected = [{"apiGroups": ("",), "resources": ("pods",), "verbs": ("get",)}]
+
+    cluster_role = get_cluster_role("mcp-reader", "mcp-server", rules)
+    assert "namespace" not in cluster_role["metadata"]
+    assert cluster_role["rules"] == expected
+
+    role = get_role("mcp", "mcp-reader", "mcp-server", rules)
+    assert role["metadata"]["namespace"] == "mcp"
+    assert role["rules"] == expected
+
+
+def test_default_rules_are_converted():
+    role = get_cluster_role("mcp-reader", "mcp-server", DEFAULT_RBAC_RULES)
+    assert [rule["apiGroups"] for rule in role["rules"]] == [("",), ("apps",), ("batch",)]
+    assert role["rules"][0]["verbs"] == ("get", "list", "watch")
+
+
+def test_manifests_do_not_share_mutable_state():
+    first = get_role("mcp", "a", "mcp-server", DEFAULT_RBAC_RULES)
+    first["metadata"]["labels"]["extra"] = "x"
+    first["rules"].clear()
+
+    second = get_role("mcp", "b", "mcp-server", DEFAULT_RBAC_RULES)
+    assert second["metadata"]["labels"] == {"app": "mcp-server", "component": "rbac"}
+    assert len(second["rules"]) == len(DEFAULT_RBAC_RULES)
+
+
+def test_every_manifest_gets_the_rbac_labels():
+    labels = {"app": "mcp-server", "component": "rbac"}
+    manifests = [
+        get_service_account("mcp", "mcp-sa", "mcp-server"),
+        get_cluster_role("mcp-reader", "mcp-server", DEFAULT_RBAC_RULES),
+        get_role("mcp", "mcp-reader", "mcp-server", DEFAULT_RBAC_RULES),
+        get_cluster_role_binding("mcp-crb", "mcp-sa", "mcp", "mcp-reader", "mcp-server"),
+        get_role_binding("mcp", "mcp-rb", "mcp-sa", "mcp-reader", "mcp-server"),
+    ]
+    assert all(manifest["metadata"]["labels"] == labels for manifest in manifests)
+
+
+def test_service_account_manifest():
+    assert get_service_account("mcp", "mcp-sa", "mcp-server") == {
+        "apiVersion": "v1",
+        "kind": "ServiceAccount",
+        "metadata": {
+            "name": "mcp-sa",
+            "namespace": "mcp",
+            "labels": {"app": "mcp-server", "component": "rbac"},
+        },
+    }
+
+
+def test_role_manifest_headers():
+    cluster_role = get_cluster_role("mcp-reader", "mcp-server", DEFAULT_RBAC_RULES)
+    assert cluster_role["apiVersion"] == "rbac.authorization.k8s.io/v1"
+    assert cluster_role["kind"] == "ClusterRole"
+
+    role = get_role("mcp", "mcp-reader", "mcp-server", DEFAULT_RBAC_RULES)
+    assert role["apiVersion"] == "rbac.authorization.k8s.io/v1"
+    assert role["kind"] == "Role"
+
+
+def test_binding_manifests():
+    crb = get_cluster_role_binding("mcp-crb", "mcp-sa", "mcp", "mcp-reader", "mcp-server")
+    assert crb["apiVersion"] == "rbac.authorization.k8s.io/v1"
+    assert crb["kind"] == "ClusterRoleBinding"
+    assert crb["subjects"] == [{"kind": "ServiceAccount", "name": "mcp-sa", "namespace": "mcp"}]
+    assert crb["roleRef"] == {
+        "kind": "ClusterRole",
+        "name": "mcp-reader",
+        "apiGroup": "rbac.authorization.k8s.io",
+    }
+
+    rb = get_role_binding("mcp", "mcp-rb", "mcp-sa", "mcp-reader", "mcp-server")
+    assert rb["kind"] == "RoleBinding"
+    assert rb["metadata"]["namespace"] == "mcp"
+    assert rb["subjects"][0]["namespace"] == "mcp"
+    assert rb["roleRef"] == {
+        "kind": "Role",
+        "name": "mcp-reader",
+        "apiGroup": "rbac.authorization.k8s.io",
+    }
+
+
+@pytest.fixture
+def apis(monkeypatch):
+    """The (CoreV1Api, RbacAuthorizationV1Api) mocks a manager gets, with config loading stubbed."""
+    core_v1, rbac_v1 = mock.Mock(), mock.Mock()
+    monkeypatch.setattr(setup_rbac, "_load_kube_config", mock.Mock(return_value="Loaded"))
+    monkeypatch.setattr("kubernetes.client.CoreV1Api", mock.Mock(return_value=core_v1))
+    monkeypatch.setattr("kubernetes.client.RbacAuthorizationV1Api", mock.Mock(return_value=rbac_v1))
+    return core_v1, rbac_v1
+
+
+KUBECONFIG = """\
+apiVersion: v1
+kind: Config
+clusters:
+- name: test
+  cluster:
+    server: https://127.0.0.1:6443
+users:
+- name: test
+  user:
+    token: test-token
+contexts:
+- name: test
+  context:
+    cluster: test
+    user: test
+    namespace: team-a
+current-context: test
+"""
+
+
+@pytest.fixture
+def kubeconfig(tmp_path, monkeypatch):
+    """Point the default kubeconfig location at a one-context test file."""
+    path = tmp_path / "config"
+    path.write_text(KUBECONFIG)
+    monkeypatch.setattr("kubernetes.config.kube_config.KUBE_CONFIG_DEFAULT_LOCATION", str(path))
+    setup_rbac._kubeconfig_loader.cache_clear()
+    yield path
+    setup_rbac._kubeconfig_loader.cache_clear()
+
+
+def make_manager(dry_run=False):
+    return RBACManager("mcp", DEFAULT_RBAC_RULES, dry_run=dry_run)
+
+
+def test_apply_sends_server_side_apply_patch(apis):
+    _, rbac_v1 = apis
+
+    assert make_manager().create_role("mcp", "mcp-reader")
+
+    patch = rbac_v1.patch_namespaced_role
+    patch.assert_called_once()
+    assert patch.call_args.args == ("mcp-reader", "mcp")
+    kwargs = patch.call_args.kwargs
+    assert kwargs["body"] == get_role("mcp", "mcp-reader", "mcp-server", DEFAULT_RBAC_RULES)
+    assert kwargs["field_manager"] == "mcp-base"
+    assert kwargs["force"] is True
+    assert kwargs["_content_type"] == "application/apply-patch+yaml"
+    rbac_v1.read_namespaced_role.assert_not_called()
+    rbac_v1.create_namespaced_role.assert_not_called()
+
+
+def test_cluster_scoped_apply_passes_only_the_name(apis):
+    _, rbac_v1 = apis
+
+    assert make_manager().create_cluster_role_binding("mcp-crb", "mcp-sa", "mcp", "mcp-reader")
+
+    patch = rbac_v1.patch_cluster_role_binding
+    assert patch.call_args.args == ("mcp-crb",)
+    assert patch.call_args.kwargs["body"]["roleRef"]["name"] == "mcp-reader"
+
+
+def test_apply_failure_reports_hint_on_403(apis, capsys):
+    core_v1, _ = apis
+    core_v1.patch_namespaced_service_account.side_effect = ApiException(
+        status=403, reason="Forbidden"
+    )
+
+    assert not make_manager().create_service_account("mcp", "mcp-sa")
+
+    err = capsys.readouterr().err
+    assert "Failed to create ServiceAccount mcp/mcp-sa: Forbidden" in err
+    assert "Hint:" in err
+
+
+def test_dry_run_makes_no_requests(apis, capsys):
+    _, rbac_v1 = apis
+
+    assert make_manager(dry_run=True).create_cluster_role("mcp-reader")
+
+    rbac_v1.patch_cluster_role.assert_not_called()
+    assert "[DRY RUN] Would apply ClusterRole: mcp-reader" in capsys.readouterr().out
+
+
+def test_kube_config_is_loaded_once(monkeypatch):
+    load_incluster_config = mock.Mock()
+    monkeypatch.setattr("kubernetes.config.load_incluster_config", load_incluster_config)
+    setup_rbac._load_kube_config.cache_clear()
+    try:
+        assert setup_rbac._load_kube_config() == "Loaded in-cluster Kubernetes config"
+        setup_rbac._load_kube_config()
+    finally:
+        setup_rbac._load_kube_config.cache_clear()
+    load_incluster_config.assert_called_once()
+
+
+def test_current_namespace_comes_from_the_kubeconfig(kubeconfig):
+    assert get_current_namespace() == "team-a"
@@ -0,0 +1,78 @@
+"""Tests for the on-disk management token cache."""
+
+import os
+import stat
+import time
+
+import pytest
+
+from mcp_base import _token_cache
+from mcp_base._token_cache import (
+    EXPIRY_MARGIN,
+    clear_cached_token,
+    get_cached_token,
+    save_cached_token,
+    token_cache_path,
+)
+
+DOMAIN = "tenant.auth0.com"
+
+
+def test_roundtrip():
+    save_cached_token(DOMAIN, "client-a", "token-a", 86400)
+    assert get_cached_token(DOMAIN, "client-a") == "token-a"
+
+
+def test_path_is_under_xdg_cache_home(cache_home):
+    assert token_cache_path(DOMAIN, "client-a").parent == cache_home / "mcp-base"
+
+
+def test_cache_is_keyed_by_domain_and_client():
+    save_cached_token(DOMAIN, "client-a", "token-a", 86400)
+    assert get_cached_token(DOMAIN, "client-b") is None
+    assert get_cached_token("other.auth0.com", "client-a") is None
+
+
+def test_expired_token_misses():
+    save_cached_token(DOMAIN, "client-a", "token-a", -1)
+    assert get_cached_token(DOMAIN, "client-a") is None
+
+
+def test_token_inside_expiry_margin_misses(monkeypatch):
+    save_cached_token(DOMAIN, "client-a", "token-a", EXPIRY_MARGIN + 10)
+    now = time.time()
+    monkeypatch.setattr(_token_cache.time, "time", lambda: now + 20)
+    assert get_cached_token(DOMAIN, "client-a") is None
+
+
+def test_file_is_owner_only_and_no_temp_file_left():
+    save_cached_token(DOMAIN, "client-a", "token-a", 86400)
+    path = token_cache_path(DOMAIN, "client-a")
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert os.listdir(path.parent) == [path.name]
+
+
+def test_rewrite_keeps_owner_only_permissions():
+    path = token_cache_path(DOMAIN, "client-a")
+    path.parent.mkdir(parents=True)
+    path.write_text("{}")
+    path.chmod(0o644)
+    save_cached_token(DOMAIN, "client-a", "token-a", 86400)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert get_cached_token(DOMAIN, "client-a") == "token-a"
+
+
+@pytest.mark.parametrize("content", [b"", b"not json", b"[]", b'{"exp": 1}', b'{"access_token": "x"}'])
+def test_corrupt_file_misses(content):
+    path = token_cache_path(DOMAIN, "client-a")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(content)
+    assert get_cached_token(DOMAIN, "client-a") is None
+
+
+def test_clear():
+    save_cached_token(DOMAIN, "client-a", "token-a", 86400)
+    clear_cached_token(DOMAIN, "client-a")
+    assert get_cached_token(DOMAIN, "client-a") is None
+    # Clearing a missing entry is not an error
+    clear_cached_token(DOMAIN, "client-a")